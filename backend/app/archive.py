@@ -0,0 +1,91 @@
+"""
+Arquivo de notícias por mês
+
+A tabela news_archive guarda quantas notícias existem em cada mês e é
+atualizada na mesma transação de cada escrita em notícias (adjust_archive),
+para que GET /api/news/archive não precise agrupar a tabela news inteira.
+
+Reconstrução a partir da tabela news, se as contagens divergirem (no diretório backend):
+    python -m app.archive
+"""
+from collections import Counter
+from datetime import date as date_type
+from typing import Dict, Iterable, List
+import asyncio
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine, News, NewsArchive, UPSERTS
+
+def month_of(news_date: date_type) -> date_type:
+    return news_date.replace(day=1)
+
+def _deltas(added: Iterable[date_type], removed: Iterable[date_type]) -> Dict[date_type, int]:
+    deltas = Counter(month_of(news_date) for news_date in added)
+    deltas.subtract(month_of(news_date) for news_date in removed)
+    return {month: delta for month, delta in deltas.items() if delta}
+
+async def adjust_archive(
+    db: AsyncSession,
+    added: Iterable[date_type] = (),
+    removed: Iterable[date_type] = (),
+) -> None:
+    """Update the monthly counts in the current transaction
+
+    `added` are the dates of created news (and the new date of re-dated
+    ones); `removed` the dates of deleted news (and the old date of re-dated ones).
+    """
+    deltas = _deltas(added, removed)
+    if not deltas:
+        return
+    upsert = UPSERTS[db.bind.dialect.name](NewsArchive)
+    # Atomic increments: concurrent writers never lose an update
+    await db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[NewsArchive.month],
+            set_={"count": NewsArchive.count + upsert.excluded.count},
+        ),
+        [{"month": month, "count": delta} for month, delta in deltas.items()],
+    )
+    await db.execute(
+        delete(NewsArchive).where(NewsArchive.month.in_(deltas), NewsArchive.count <= 0)
+    )
+
+async def load_archive(db: AsyncSession) -> List[dict]:
+    """Monthly counts, newest month first"""
+    rows = await db.execute(
+        select(NewsArchive.month, NewsArchive.count)
+        .where(NewsArchive.count > 0)
+        .order_by(NewsArchive.month.desc())
+    )
+    return [{"year": row.month.year, "month": row.month.month, "count": row.count} for row in rows]
+
+def rebuild_archive(conn: Connection) -> int:
+    """Recount every month from the news table; returns the number of months"""
+    if conn.dialect.name == "postgresql":
+        # Writers wait until the recount commits, then apply their own
+        # increments on top of it; none is counted twice or lost
+        conn.execute(text("LOCK TABLE news_archive IN EXCLUSIVE MODE"))
+    # Grouped by day (one index scan, portable SQL), then by month here
+    counts: Counter = Counter()
+    for news_date, count in conn.execute(select(News.date, func.count()).group_by(News.date)):
+        counts[month_of(news_date)] += count
+    conn.execute(delete(NewsArchive))
+    if counts:
+        conn.execute(
+            NewsArchive.__table__.insert(),
+            [{"month": month, "count": count} for month, count in counts.items()],
+        )
+    return len(counts)
+
+async def _main() -> None:
+    try:
+        async with engine.begin() as conn:
+            months = await conn.run_sync(rebuild_archive)
+        print(f"Arquivo de notícias reconstruído: {months} meses")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(_main())
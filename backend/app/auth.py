@@ -1,12 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status, Cookie
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db, AdminUser
+from app.cache import TTLCache
+from app.revocation import revocations
+from app.metrics import (
+    observe_password_hash,
+    record_password_hash_rejected,
+    register_cache,
+    register_gauge,
+)
+import asyncio
 import os
+import time
+import uuid
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,9 +28,35 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))  # 24 hours
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt work factor; hashes made with a different cost are upgraded on next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 security = HTTPBearer(auto_error=False)
 
+# Authenticated AdminUser rows keyed by token subject (email). Entries never
+# outlive the token that populated them and are dropped when the user changes
+# through the ORM in this process. Changes made by SQL, scripts or another
+# worker only take effect when the entry expires, so the TTL stays short;
+# 0 disables the cache.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "5"))
+principal_cache = TTLCache(
+    int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "1024")),
+    PRINCIPAL_CACHE_TTL_SECONDS,
+)
+register_cache("principal", principal_cache)
+
+def invalidate_principal(email: str) -> None:
+    """Drop the cached principal for email"""
+    principal_cache.delete(email)
+
+@event.listens_for(AdminUser, "after_update")
+@event.listens_for(AdminUser, "after_delete")
+def _invalidate_changed_principal(mapper, connection, target: AdminUser) -> None:
+    invalidate_principal(target.email)
+    # The user may have been cached under a previous email
+    for old_email in inspect(target).attrs.email.history.deleted:
+        invalidate_principal(old_email)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -26,6 +65,65 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+# bcrypt is deliberately slow, so it runs off the event loop in a small pool.
+# PASSWORD_HASH_QUEUE_LIMIT caps jobs running + waiting; beyond that, callers
+# get a 503 instead of piling up behind the pool.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16"))
+_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_hash_jobs = 0
+_dummy_hash: Optional[str] = None
+
+async def _run_hash_job(func, *args):
+    global _hash_jobs
+    if _hash_jobs >= PASSWORD_HASH_QUEUE_LIMIT:
+        record_password_hash_rejected()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado. Tente novamente em instantes.",
+            headers={"Retry-After": "1"},
+        )
+    _hash_jobs += 1
+    start = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_jobs -= 1
+        observe_password_hash(time.perf_counter() - start)
+
+register_gauge(
+    "semear_password_hash_jobs",
+    "Operações de bcrypt em execução ou na fila.",
+    lambda: _hash_jobs,
+)
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password in the hashing pool; also returns a new hash if the stored one is outdated"""
+    return await _run_hash_job(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def hash_password(password: str) -> str:
+    """Hash a password in the hashing pool"""
+    return await _run_hash_job(pwd_context.hash, password)
+
+async def prepare_dummy_hash() -> None:
+    """Hash the dummy password once at startup, so unknown-email logins cost one bcrypt like real ones"""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await hash_password("dummy-password")
+
+async def dummy_verify_password(plain_password: str) -> None:
+    """Spend the same bcrypt time as a real check, for logins with an unknown email"""
+    if _dummy_hash is None:
+        await prepare_dummy_hash()
+    await _run_hash_job(pwd_context.verify, plain_password, _dummy_hash)
+
+def shutdown_hash_executor() -> None:
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -33,22 +131,36 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # jti: lets logout revoke this token (app/revocation.py)
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[dict]:
-    """Verify and decode a JWT token"""
+    """Verify and decode a JWT token; None if invalid, expired or revoked"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    # Tokens without a jti (issued before revocation existed) are rejected, so
+    # every session from before the upgrade has to log in again
+    jti = payload.get("jti")
+    if not isinstance(jti, str) or revocations.is_revoked(jti):
+        return None
+    return payload
 
-def get_current_user(
+def request_token(
+    access_token: Optional[str], credentials: Optional[HTTPAuthorizationCredentials]
+) -> Optional[str]:
+    """Token from the cookie, else from the Authorization header"""
+    if access_token:
+        return access_token
+    return credentials.credentials if credentials else None
+
+async def get_current_user(
     access_token: Optional[str] = Cookie(None, alias="access_token"),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> AdminUser:
     """Get the current authenticated user"""
     credentials_exception = HTTPException(
@@ -57,11 +169,7 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    # Try to get token from cookie first, then from Authorization header
-    token = access_token
-    if not token and credentials:
-        token = credentials.credentials
-    
+    token = request_token(access_token, credentials)
     if not token:
         raise credentials_exception
     
@@ -73,9 +181,19 @@ def get_current_user(
     if email is None:
         raise credentials_exception
     
-    user = db.query(AdminUser).filter(AdminUser.email == email).first()
+    user = principal_cache.get(email)
+    if user is not None:
+        return user
+
+    user = await db.scalar(select(AdminUser).where(AdminUser.email == email))
     if user is None:
         raise credentials_exception
+
+    ttl = min(PRINCIPAL_CACHE_TTL_SECONDS, payload.get("exp", 0) - time.time())
+    if ttl > 0:
+        # Detached, so a rollback in this request can't expire the shared instance
+        db.expunge(user)
+        principal_cache.set(email, user, ttl=ttl)
     
     return user
 
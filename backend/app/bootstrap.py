@@ -0,0 +1,50 @@
+"""
+Preparação única do banco antes de iniciar a API
+
+Aplica as migrações pendentes (app/migrations.py), cria o administrador e as
+notícias iniciais se não existirem e republica os arquivos estáticos de
+notícias (quando STATIC_NEWS_DIR está configurado). Rode uma vez por deploy,
+antes dos workers; cada etapa é idempotente e tem o tempo reportado.
+
+Uso (no diretório backend):
+    python -m app.bootstrap
+"""
+from typing import Awaitable
+import asyncio
+import time
+
+from app.database import engine
+from app.init_data import init_data
+from app.migrations import migrate
+from app.publisher import rebuild_all
+from app.auth import shutdown_hash_executor
+
+async def _timed(step: str, work: Awaitable):
+    start = time.perf_counter()
+    result = await work
+    print(f"{step}: {time.perf_counter() - start:.3f}s")
+    return result
+
+async def bootstrap() -> None:
+    """Migrate, seed and publish; safe to run repeatedly"""
+    start = time.perf_counter()
+    previous, current = await _timed("migrações", migrate())
+    if previous == current:
+        print(f"Esquema já na versão {current}")
+    else:
+        print(f"Esquema migrado da versão {previous} para {current}")
+    await _timed("dados iniciais", init_data())
+    published = await _timed("arquivos estáticos", rebuild_all())
+    if published:
+        print(f"{published} notícias publicadas")
+    print(f"Bootstrap concluído em {time.perf_counter() - start:.3f}s")
+
+async def _main() -> None:
+    try:
+        await bootstrap()
+    finally:
+        shutdown_hash_executor()
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,89 @@
+"""
+Cache em memória (LRU com TTL) para as leituras públicas de notícias
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional
+import os
+import time
+from dotenv import load_dotenv
+
+from app.metrics import register_cache
+
+load_dotenv()
+
+NEWS_CACHE_MAX_ENTRIES = int(os.getenv("NEWS_CACHE_MAX_ENTRIES", "256"))
+NEWS_CACHE_TTL_SECONDS = float(os.getenv("NEWS_CACHE_TTL_SECONDS", "300"))
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a time-to-live"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key, evicting the least recently used entry if full"""
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+            }
+
+news_cache = TTLCache(NEWS_CACHE_MAX_ENTRIES, NEWS_CACHE_TTL_SECONDS)
+register_cache("news", news_cache)
+
+# Entries are keyed by the shared change versions (ChangeBroadcaster in
+# app/changes.py), so other workers' writes show up within
+# NEWS_CHANGES_POLL_SECONDS. A local news write also drops the entries of
+# older versions at once instead of leaving them to expire.
+_news_version = 0
+
+def bump_news_version() -> int:
+    """Invalidate all cached news reads after a write"""
+    global _news_version
+    _news_version += 1
+    news_cache.clear()
+    return _news_version
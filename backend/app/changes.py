@@ -0,0 +1,219 @@
+"""
+Feed de alterações das notícias
+
+Toda escrita em notícias grava em news_changes, na mesma transação, uma linha
+por notícia alterada; o número da linha (`version`) cresce sempre. Um cliente
+guarda a última versão que recebeu e pede apenas o que mudou depois dela
+(GET /api/news/changes?since=), inclusive as notícias removidas.
+
+Cada worker tem um único ChangeBroadcaster, que guarda em memória a versão
+mais recente: as escritas do próprio worker a atualizam na hora, e uma tarefa
+consulta o banco a cada NEWS_CHANGES_POLL_SECONDS para perceber as escritas
+dos outros workers. Essa versão identifica os dados das leituras públicas
+(chave do cache e ETag, em app/http_cache.py), sem consulta por requisição, e
+avisa os clientes conectados por SSE (GET /api/news/changes/stream). Uma
+conexão ociosa é só uma corrotina esperando um evento comum. A mesma tarefa
+acompanha contacts.version, que junto com a versão das notícias é a chave do
+cache de GET /api/site.
+"""
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+import asyncio
+import os
+from dotenv import load_dotenv
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal, Contact, News, NewsChange, note_remote_write
+from app.metrics import register_gauge
+from app.serializers import NEWS_FIELDS, dump_json, news_to_dict
+
+load_dotenv()
+
+NEWS_CHANGES_POLL_SECONDS = float(os.getenv("NEWS_CHANGES_POLL_SECONDS", "2"))
+NEWS_CHANGES_HEARTBEAT_SECONDS = float(os.getenv("NEWS_CHANGES_HEARTBEAT_SECONDS", "15"))
+NEWS_CHANGES_MAX_STREAMS = int(os.getenv("NEWS_CHANGES_MAX_STREAMS", "1000"))
+# Streams end after this long and EventSource reconnects (with Last-Event-ID),
+# so a worker shutting down never waits on an endless response
+NEWS_CHANGES_STREAM_SECONDS = float(os.getenv("NEWS_CHANGES_STREAM_SECONDS", "300"))
+
+COLUMNS = tuple(getattr(News, field) for field in NEWS_FIELDS)
+
+async def record_changes(db: AsyncSession, news_ids: Iterable[int]) -> Optional[int]:
+    """Log writes to news_ids in the current transaction; returns the new version"""
+    news_ids = list(news_ids)
+    if not news_ids:
+        return None
+    if db.bind.dialect.name == "postgresql":
+        # Versions must become visible in order: a reader that saw version N must
+        # never find N-1 committed later. Writers take turns until they commit;
+        # readers aren't blocked. SQLite already serializes writers.
+        await db.execute(text("LOCK TABLE news_changes IN EXCLUSIVE MODE"))
+    # Stamped once the lock is held, so later versions never get an earlier
+    # time (now() in PostgreSQL is the start of the transaction)
+    changed_at = datetime.now(timezone.utc)
+    rows = [{"news_id": news_id, "changed_at": changed_at} for news_id in news_ids]
+    versions = await db.scalars(insert(NewsChange).returning(NewsChange.version), rows)
+    return max(versions)
+
+async def latest_version(db: AsyncSession) -> int:
+    return await db.scalar(select(func.max(NewsChange.version))) or 0
+
+async def latest_contact_version(db: AsyncSession) -> int:
+    return await db.scalar(select(func.max(Contact.version))) or 0
+
+async def latest_change(db: AsyncSession) -> Tuple[int, Optional[datetime]]:
+    """Current version and when it was written (None if unknown)"""
+    row = (await db.execute(
+        select(NewsChange.version, NewsChange.changed_at)
+        .order_by(NewsChange.version.desc())
+        .limit(1)
+    )).first()
+    if row is None:
+        return 0, None
+    changed_at = row.changed_at
+    if changed_at is not None and changed_at.tzinfo is None:
+        # SQLite keeps CURRENT_TIMESTAMP (UTC) without a zone
+        changed_at = changed_at.replace(tzinfo=timezone.utc)
+    return row.version, changed_at
+
+async def load_changes(db: AsyncSession, since: int, limit: int) -> Tuple[int, List[dict], List[int], bool]:
+    """Current state of the news changed after `since`
+
+    Returns (version, changed news, deleted ids, has_more): each news item
+    appears once, with its latest state; `version` is where the next call
+    should continue from.
+    """
+    latest = (
+        select(NewsChange.news_id, func.max(NewsChange.version).label("version"))
+        .where(NewsChange.version > since)
+        .group_by(NewsChange.news_id)
+        .order_by(func.max(NewsChange.version))
+        .limit(limit + 1)
+        .subquery()
+    )
+    rows = (await db.execute(
+        select(latest.c.news_id, latest.c.version, News.id.label("id"), *COLUMNS)
+        .outerjoin(News, News.id == latest.c.news_id)
+        .order_by(latest.c.version)
+    )).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changed, deleted = [], []
+    for row in rows:
+        if row.id is None:
+            deleted.append(row.news_id)
+        else:
+            changed.append(news_to_dict(row))
+    if rows:
+        version = rows[-1].version
+    else:
+        # Nothing new: report the current version (also corrects a `since`
+        # from a database that was reset)
+        version = await latest_version(db)
+    return version, changed, deleted, has_more
+
+class ChangeBroadcaster:
+    """Tells every SSE connection of this worker about new change versions"""
+
+    def __init__(self):
+        self.version = 0
+        # When self.version was written (Last-Modified of the public reads)
+        self.changed_at: Optional[datetime] = None
+        self.contact_version = 0
+        self.streams = 0
+        self._changed: Optional[asyncio.Event] = None
+        self._poller: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        async with SessionLocal() as db:
+            self.version, self.changed_at = await latest_change(db)
+            self.contact_version = await latest_contact_version(db)
+        self._changed = asyncio.Event()
+        self._poller = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+
+    def publish(self, version: Optional[int], changed_at: Optional[datetime] = None) -> None:
+        """Record a newer version (this worker's write if changed_at is None) and wake up every waiting connection"""
+        if version is None or version <= self.version:
+            return
+        if changed_at is None:
+            # Written here and just committed
+            changed_at = datetime.now(timezone.utc)
+        else:
+            # Another worker's write: keep this worker's reads off a replica
+            # that may not have it yet (see get_read_db)
+            note_remote_write()
+        self.version = version
+        # Never goes backwards, or If-Modified-Since could match stale data
+        self.changed_at = max(filter(None, (self.changed_at, changed_at)))
+        if self._changed is not None:
+            # Each version gets a fresh event; waiters keep a reference to the old one
+            changed, self._changed = self._changed, asyncio.Event()
+            changed.set()
+
+    def publish_contact(self, version: int, remote: bool = False) -> None:
+        """Record a newer contact version (this worker's write unless remote)"""
+        if version <= self.contact_version:
+            return
+        if remote:
+            note_remote_write()
+        self.contact_version = version
+
+    async def wait(self, version: int, timeout: float) -> int:
+        """Return the current version once it is newer than version, or after timeout"""
+        if self.version <= version and self._changed is not None:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.version
+
+    async def _poll(self) -> None:
+        # Writes made by other workers only show up in the database
+        while True:
+            await asyncio.sleep(NEWS_CHANGES_POLL_SECONDS)
+            try:
+                async with SessionLocal() as db:
+                    version, changed_at = await latest_change(db)
+                    contact_version = await latest_contact_version(db)
+                self.publish(version, changed_at or datetime.now(timezone.utc))
+                self.publish_contact(contact_version, remote=True)
+            except Exception as e:
+                print(f"Erro ao consultar alterações de notícias e do contato: {e}")
+
+    async def events(self, since: int) -> AsyncIterator[bytes]:
+        """Server-sent events: one `version` event per new version, plus heartbeats"""
+        self.streams += 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + NEWS_CHANGES_STREAM_SECONDS
+        try:
+            # Reconnect delay used by EventSource
+            yield b"retry: 5000\n\n"
+            while loop.time() < deadline:
+                timeout = min(NEWS_CHANGES_HEARTBEAT_SECONDS, deadline - loop.time())
+                version = await self.wait(since, timeout)
+                if version > since:
+                    since = version
+                    yield b"id: %d\nevent: version\ndata: %s\n\n" % (version, dump_json({"version": version}))
+                else:
+                    # Comment line: keeps proxies from closing an idle connection
+                    yield b": ping\n\n"
+        finally:
+            self.streams -= 1
+
+broadcaster = ChangeBroadcaster()
+register_gauge(
+    "semear_news_change_streams",
+    "Conexões SSE abertas no feed de alterações de notícias neste worker.",
+    lambda: broadcaster.streams,
+)
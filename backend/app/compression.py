@@ -0,0 +1,87 @@
+"""
+Compressão (brotli/gzip) das respostas públicas de notícias
+
+O corpo JSON fica no cache de notícias dentro de um EncodedBody, que guarda
+também as versões comprimidas: cada codificação é calculada uma única vez por
+versão dos dados e as requisições seguintes apenas reenviam os bytes prontos.
+A codificação é escolhida pelo cabeçalho Accept-Encoding; corpos menores que
+COMPRESSION_MIN_BYTES seguem sem compressão.
+"""
+from functools import lru_cache
+from typing import Dict, Optional
+import asyncio
+import gzip
+import os
+import brotli
+from dotenv import load_dotenv
+from fastapi import Request, Response
+
+from app.serializers import json_bytes_response
+
+load_dotenv()
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "8"))
+
+ENCODERS = {
+    "br": lambda data: brotli.compress(data, quality=BROTLI_QUALITY, mode=brotli.MODE_TEXT),
+    "gzip": lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0),
+}
+# Server preference when the client weighs several encodings equally
+PREFERRED_ENCODINGS = ("br", "gzip")
+
+class EncodedBody:
+    """A response body together with its compressed variants"""
+
+    __slots__ = ("raw", "_encoded")
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._encoded: Dict[str, bytes] = {}
+
+    async def encode(self, encoding: str) -> bytes:
+        """Return the body compressed with encoding, compressing it on first use"""
+        data = self._encoded.get(encoding)
+        if data is None:
+            # Once per data version; large pages would otherwise stall the event loop
+            data = await asyncio.to_thread(ENCODERS[encoding], self.raw)
+            self._encoded[encoding] = data
+        return data
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in PREFERRED_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+async def encoded_response(request: Request, body: EncodedBody, headers: dict | None = None) -> Response:
+    """JSON response in the best encoding the client accepts"""
+    if len(body.raw) < COMPRESSION_MIN_BYTES:
+        return json_bytes_response(body.raw, headers)
+
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is None:
+        return json_bytes_response(body.raw, headers)
+    headers["Content-Encoding"] = encoding
+    return json_bytes_response(await body.encode(encoding), headers)
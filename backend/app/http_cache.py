@@ -0,0 +1,98 @@
+"""
+Requisições condicionais e cache do nginx para as leituras públicas de notícias
+
+Toda escrita em notícias gera uma nova versão no feed de alterações
+(app/changes.py), então a versão mais recente identifica os dados de todas as
+leituras públicas. Cada worker a mantém em memória (ChangeBroadcaster), e ela
+é a chave do cache de notícias e o ETag (junto com a codificação negociada,
+já que corpos comprimidos são outra representação); o horário da alteração
+vira o Last-Modified. Acertos no cache e respostas 304 (If-None-Match ou
+If-Modified-Since atualizados) não consultam o banco. As escritas de outros
+workers aparecem em até NEWS_CHANGES_POLL_SECONDS.
+
+O nginx guarda essas respostas (proxy_cache) e as revalida com o backend.
+Com NGINX_CACHE_DIR apontando para o mesmo diretório do proxy_cache_path,
+cada escrita apaga o cache do nginx pela fila de tarefas (app/jobs.py), para
+que as leituras seguintes já vejam os dados novos.
+"""
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+import asyncio
+import os
+from dotenv import load_dotenv
+from fastapi import Request, Response
+
+from app.changes import broadcaster
+from app.compression import negotiate_encoding
+from app.jobs import jobs
+
+load_dotenv()
+
+NGINX_CACHE_DIR = os.getenv("NGINX_CACHE_DIR")
+
+# Browsers and shared caches keep the body but revalidate it on every use
+NEWS_CACHE_CONTROL = "public, no-cache"
+
+class NewsFreshness:
+    """Validators of the news data as of one change version"""
+
+    __slots__ = ("version", "last_modified", "headers")
+
+    def __init__(self, request: Request, version: int, changed_at: Optional[datetime]):
+        self.version = version
+        self.last_modified = changed_at.replace(microsecond=0) if changed_at else None
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", "")) or "identity"
+        self.headers = {
+            "ETag": f'"n{version}-{encoding}"',
+            "Cache-Control": NEWS_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if self.last_modified:
+            self.headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+
+    def not_modified(self, request: Request) -> Optional[Response]:
+        """304 response if the client's copy is current, else None"""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # Weak comparison (RFC 9110): W/ prefixes added by proxies don't matter.
+            # "*" is not a match: this runs before the handler knows the item exists
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            fresh = self.headers["ETag"] in tags
+        else:
+            fresh = self._unmodified_since(request.headers.get("if-modified-since"))
+        return Response(status_code=304, headers=self.headers) if fresh else None
+
+    def _unmodified_since(self, if_modified_since: Optional[str]) -> bool:
+        if not if_modified_since or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return since.tzinfo is not None and self.last_modified <= since
+
+def news_freshness(request: Request) -> NewsFreshness:
+    """Validators for a public news read, from this worker's current version"""
+    return NewsFreshness(request, broadcaster.version, broadcaster.changed_at)
+
+def _clear_directory(root: Path) -> int:
+    removed = 0
+    for directory, _, files in os.walk(root):
+        for name in files:
+            try:
+                os.unlink(os.path.join(directory, name))
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+async def _purge_nginx_cache() -> None:
+    # Removed entries are misses for nginx; it fetches them again from the backend
+    await asyncio.to_thread(_clear_directory, Path(NGINX_CACHE_DIR))
+
+def schedule_proxy_purge() -> None:
+    """Drop every cached public news response from nginx after a write"""
+    if NGINX_CACHE_DIR:
+        jobs.submit("purge-nginx-cache", _purge_nginx_cache)
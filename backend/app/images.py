@@ -0,0 +1,84 @@
+"""
+Geração das variantes responsivas das imagens de notícias
+
+Executado em processos separados (app/media.py), sem importar o restante da
+aplicação: abre a imagem enviada, redimensiona para cada largura e grava
+WebP e JPEG com o nome derivado do hash do conteúdo (endereçamento por
+conteúdo), para que o nginx sirva os arquivos com cache imutável.
+"""
+from io import BytesIO
+from pathlib import Path
+from typing import List, Sequence
+import hashlib
+import os
+import tempfile
+import warnings
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+ACCEPTED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+
+# (file extension, Pillow format, save options)
+OUTPUT_FORMATS = (
+    ("webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+class InvalidImageError(ValueError):
+    pass
+
+def _store(root: Path, data: bytes, extension: str) -> str:
+    """Write data under its SHA-256 name; returns the path relative to root"""
+    digest = hashlib.sha256(data).hexdigest()
+    relative = f"{digest[:2]}/{digest}.{extension}"
+    path = root / relative
+    if path.exists():
+        return relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".", suffix=".tmp", delete=False) as tmp:
+        tmp.write(data)
+    # NamedTemporaryFile creates 0600 files; nginx runs as another user
+    os.chmod(tmp.name, 0o644)
+    os.replace(tmp.name, path)
+    return relative
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        # JPEG has no alpha channel: flatten transparent areas onto white
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+def make_variants(source: str, root: str, widths: Sequence[int], max_pixels: int) -> List[dict]:
+    """Resize the image at source to each width (never upscaling), as WebP and JPEG"""
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    variants = []
+    with warnings.catch_warnings():
+        # Pillow only warns between max_pixels and twice that; reject both
+        warnings.simplefilter("error", Image.DecompressionBombWarning)
+        try:
+            with Image.open(source) as original:
+                if original.format not in ACCEPTED_FORMATS:
+                    raise InvalidImageError(f"formato não suportado ({original.format})")
+                original.load()
+                image = _to_rgb(ImageOps.exif_transpose(original))
+        except (UnidentifiedImageError, Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+            raise InvalidImageError(str(e)) from None
+        except (OSError, SyntaxError) as e:
+            # Truncated or corrupt files
+            raise InvalidImageError(f"arquivo corrompido ({e})") from None
+
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for extension, image_format, options in OUTPUT_FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, image_format, **options)
+            variants.append({
+                "path": _store(Path(root), buffer.getvalue(), extension),
+                "format": image_format.lower(),
+                "width": width,
+                "height": height,
+            })
+    return variants
@@ -1,51 +1,79 @@
 """
 Script para inicializar dados iniciais no banco de dados
 """
-from app.database import SessionLocal, News
+import asyncio
+import os
+from sqlalchemy import select
+from app.database import SessionLocal, News, AdminUser, Contact
 from datetime import date
+from app.archive import adjust_archive
+from app.changes import record_changes
 
-def init_data():
-    db = SessionLocal()
-    try:
-        # Check if data already exists
-        existing_news = db.query(News).first()
-        if existing_news:
-            print("Dados já inicializados. Pulando...")
-            return
-
-        # Create initial news
-        news_items = [
-            News(
-                title='Formatura de 30 novos profissionais em Culinária',
-                excerpt='Celebramos a formatura de mais uma turma do curso de Culinária Profissional.',
-                content='Na última sexta-feira, o Projeto Semear Lages realizou a cerimônia de formatura de 30 novos profissionais em Culinária. A turma, que iniciou o curso há 6 meses, demonstrou grande dedicação e habilidade durante todo o período de aprendizado.',
-                date=date(2024, 10, 15)
-            ),
-            News(
-                title='Novo laboratório de Informática inaugurado',
-                excerpt='Graças às doações recebidas, inauguramos um novo laboratório com 20 computadores modernos.',
-                content='O Projeto Semear Lages dá mais um passo importante em sua missão de capacitação profissional. Com o apoio de parceiros e doadores, foi inaugurado um novo laboratório de informática equipado com 20 computadores de última geração.',
-                date=date(2024, 10, 8)
-            ),
-            News(
-                title='Parceria com empresas locais gera 15 empregos',
-                excerpt='Nossa parceria com empresas da região resultou na contratação de 15 ex-alunos.',
-                content='O trabalho de networking e relacionamento com empresas locais está dando frutos. Nas últimas semanas, 15 ex-alunos do Projeto Semear Lages foram contratados por empresas parceiras, em diversas áreas como gastronomia, tecnologia e costura.',
-                date=date(2024, 9, 28)
-            ),
-        ]
-
-        for news in news_items:
-            db.add(news)
-
-        db.commit()
-        print("Dados iniciais criados com sucesso!")
-    except Exception as e:
-        print(f"Erro ao inicializar dados: {e}")
-        db.rollback()
-    finally:
-        db.close()
+async def init_data():
+    async with SessionLocal() as db:
+        try:
+            await _seed_admin(db)
+            await _seed_contact(db)
+            await _seed_news(db)
+        except Exception as e:
+            print(f"Erro ao inicializar dados: {e}")
+            await db.rollback()
 
-if __name__ == "__main__":
-    init_data()
+async def _seed_admin(db):
+    # Create default admin user if it doesn't exist
+    from app.auth import hash_password
+
+    admin_email = os.getenv("ADMIN_EMAIL", "admin@projetosemear.org.br")
+    admin_password = os.getenv("ADMIN_PASSWORD", "admin123")
+
+    existing_admin = await db.scalar(select(AdminUser).where(AdminUser.email == admin_email))
+    if not existing_admin:
+        db.add(AdminUser(email=admin_email, hashed_password=await hash_password(admin_password)))
+        await db.commit()
+
+async def _seed_contact(db):
+    # Contact shown on the site; edited afterwards through PUT /api/site/contact
+    if await db.scalar(select(Contact.id).limit(1)) is None:
+        db.add(Contact(email="projetosemearlages@gmail.com", phone="(49) 99138-1480"))
+        await db.commit()
+
+async def _seed_news(db):
+    # Check if data already exists
+    existing_news = await db.scalar(select(News).limit(1))
+    if existing_news:
+        print("Dados já inicializados. Pulando...")
+        return
 
+    # Create initial news
+    news_items = [
+        News(
+            title='Formatura de 30 novos profissionais em Culinária',
+            excerpt='Celebramos a formatura de mais uma turma do curso de Culinária Profissional.',
+            content='Na última sexta-feira, o Projeto Semear Lages realizou a cerimônia de formatura de 30 novos profissionais em Culinária. A turma, que iniciou o curso há 6 meses, demonstrou grande dedicação e habilidade durante todo o período de aprendizado.',
+            date=date(2024, 10, 15)
+        ),
+        News(
+            title='Novo laboratório de Informática inaugurado',
+            excerpt='Graças às doações recebidas, inauguramos um novo laboratório com 20 computadores modernos.',
+            content='O Projeto Semear Lages dá mais um passo importante em sua missão de capacitação profissional. Com o apoio de parceiros e doadores, foi inaugurado um novo laboratório de informática equipado com 20 computadores de última geração.',
+            date=date(2024, 10, 8)
+        ),
+        News(
+            title='Parceria com empresas locais gera 15 empregos',
+            excerpt='Nossa parceria com empresas da região resultou na contratação de 15 ex-alunos.',
+            content='O trabalho de networking e relacionamento com empresas locais está dando frutos. Nas últimas semanas, 15 ex-alunos do Projeto Semear Lages foram contratados por empresas parceiras, em diversas áreas como gastronomia, tecnologia e costura.',
+            date=date(2024, 9, 28)
+        ),
+    ]
+
+    for news in news_items:
+        db.add(news)
+
+    await db.flush()
+    await adjust_archive(db, added=[news.date for news in news_items])
+    await record_changes(db, [news.id for news in news_items])
+    await db.commit()
+    print("Dados iniciais criados com sucesso!")
+
+if __name__ == "__main__":
+    asyncio.run(init_data())
@@ -0,0 +1,129 @@
+"""
+Fila de tarefas em segundo plano, por worker
+
+Trabalho derivado das escritas (como republicar os arquivos estáticos) é
+enfileirado depois do commit, para que a requisição do administrador espere
+apenas pela transação. Cada tarefa tem uma chave:
+  - uma chave já na fila não é enfileirada de novo (uma rajada de edições
+    gera uma única execução, que processa tudo o que se acumulou);
+  - tarefas com a mesma chave nunca rodam ao mesmo tempo;
+  - falhas são repetidas com espera exponencial, até JOBS_MAX_ATTEMPTS vezes;
+  - ao encerrar o worker, a fila é esvaziada por até JOBS_DRAIN_TIMEOUT_SECONDS.
+"""
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
+import asyncio
+import os
+from dotenv import load_dotenv
+
+from app.metrics import register_counter, register_gauge
+
+load_dotenv()
+
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "2"))
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "5"))
+JOBS_RETRY_BASE_SECONDS = float(os.getenv("JOBS_RETRY_BASE_SECONDS", "0.5"))
+JOBS_DRAIN_TIMEOUT_SECONDS = float(os.getenv("JOBS_DRAIN_TIMEOUT_SECONDS", "10"))
+
+Job = Callable[[], Awaitable[None]]
+
+class JobQueue:
+    """Bounded-concurrency queue of keyed, coalesced and retried async jobs"""
+
+    def __init__(
+        self,
+        concurrency: int = JOBS_CONCURRENCY,
+        max_attempts: int = JOBS_MAX_ATTEMPTS,
+        retry_base: float = JOBS_RETRY_BASE_SECONDS,
+    ):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.coalesced = 0
+        self.failed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Dict[Hashable, Job] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    def submit(self, key: Hashable, job: Job) -> None:
+        """Queue job unless a job with the same key is already waiting"""
+        if self._queue is None:
+            raise RuntimeError("Fila de tarefas não iniciada")
+        if key in self._pending:
+            self.coalesced += 1
+            return
+        self._pending[key] = job
+        self._queue.put_nowait(key)
+
+    async def drain(self) -> None:
+        """Wait until every queued job has finished"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self, timeout: float = JOBS_DRAIN_TIMEOUT_SECONDS) -> None:
+        """Finish the queued jobs (up to timeout), then stop the workers"""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self.drain(), timeout)
+        except asyncio.TimeoutError:
+            print(f"Fila de tarefas encerrada com {self.pending} tarefas pendentes")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._queue = None
+        self._workers = []
+
+    async def _work(self) -> None:
+        while True:
+            key = await self._queue.get()
+            try:
+                # Same key: wait for the running job, which may not have seen
+                # the latest data, then run again
+                lock = self._locks.setdefault(key, asyncio.Lock())
+                async with lock:
+                    job = self._pending.pop(key)
+                    await self._run(key, job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, key: Hashable, job: Job) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await job()
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self.failed += 1
+                    print(f"Tarefa {key!r} falhou após {attempt} tentativas: {e}")
+                    return
+                delay = self.retry_base * 2 ** (attempt - 1)
+                print(f"Tarefa {key!r} falhou (tentativa {attempt}), repetindo em {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+
+jobs = JobQueue()
+register_gauge(
+    "semear_jobs_pending",
+    "Tarefas em segundo plano aguardando execução neste worker.",
+    lambda: jobs.pending,
+)
+register_counter(
+    "semear_jobs_coalesced_total",
+    "Tarefas em segundo plano descartadas por já haver uma igual na fila.",
+    lambda: jobs.coalesced,
+)
+register_counter(
+    "semear_jobs_failed_total",
+    "Tarefas em segundo plano que falharam em todas as tentativas.",
+    lambda: jobs.failed,
+)
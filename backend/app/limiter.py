@@ -1,9 +1,74 @@
 """
 Limiter compartilhado para rate limiting em toda a aplicação
 """
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from functools import lru_cache
+from ipaddress import ip_address, ip_network
+import os
+from dotenv import load_dotenv
+from fastapi import Request
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+
+# Registra o esquema sqlite:// no limits
+from app import ratelimit_storage  # noqa: F401
+from app.metrics import record_rate_limited
+
+load_dotenv()
+
+# memory:// conta por processo; com vários workers use um armazenamento
+# compartilhado, ex.: sqlite:////dev/shm/semear-ratelimit.db
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+
+# Proxies (IPs ou redes CIDR) cujos cabeçalhos X-Forwarded-For/X-Real-IP são confiáveis,
+# ex.: o nginx da rede do docker-compose
+TRUSTED_PROXIES = [
+    ip_network(proxy.strip(), strict=False)
+    for proxy in os.getenv("TRUSTED_PROXIES", "").split(",")
+    if proxy.strip()
+]
+
+@lru_cache(maxsize=4096)
+def _is_trusted_proxy(host: str) -> bool:
+    if not TRUSTED_PROXIES:
+        return False
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+def get_client_ip(request: Request) -> str:
+    """Client address, read from proxy headers only when the peer is a trusted proxy"""
+    peer = request.client.host if request.client else "127.0.0.1"
+    if not _is_trusted_proxy(peer):
+        return peer
+
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if forwarded_for:
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        # The right-most hop that isn't one of our proxies is the real client;
+        # anything to its left was supplied by the client and can be forged
+        for hop in reversed(hops):
+            if not _is_trusted_proxy(hop):
+                return hop
+        if hops:
+            return hops[0]
+
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip:
+        return real_ip.strip()
+    return peer
 
 # Limiter compartilhado para toda a aplicação
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_client_ip,
+    # Desligue apenas para testes de carga (benchmarks.load)
+    enabled=os.getenv("RATE_LIMIT_ENABLED", "true").lower() != "false",
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy="sliding-window-counter",
+)
 
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """slowapi's 429 response, counted in /api/metrics"""
+    record_rate_limited(request)
+    return _rate_limit_exceeded_handler(request, exc)
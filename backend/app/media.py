@@ -0,0 +1,110 @@
+"""
+Upload de imagens das notícias
+
+O corpo enviado é gravado em disco em blocos, sem ficar inteiro na memória,
+e as variantes são geradas em um pool de processos (app/images.py) para não
+bloquear o event loop. Os arquivos ficam em MEDIA_DIR com nomes derivados do
+hash do conteúdo e são servidos em MEDIA_URL (pelo nginx em produção).
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import tempfile
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+
+from app.images import InvalidImageError, make_variants
+
+load_dotenv()
+
+MEDIA_DIR = Path(os.getenv("MEDIA_DIR", "media"))
+MEDIA_URL = os.getenv("MEDIA_URL", "/media/")
+MEDIA_MAX_UPLOAD_BYTES = int(os.getenv("MEDIA_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+MEDIA_MAX_PIXELS = int(os.getenv("MEDIA_MAX_PIXELS", "40000000"))
+MEDIA_WIDTHS = tuple(
+    int(width) for width in os.getenv("MEDIA_WIDTHS", "320,640,1280").split(",") if width.strip()
+)
+MEDIA_WORKERS = int(os.getenv("MEDIA_WORKERS", "2"))
+
+# Partial uploads, removed once processed
+UPLOADS_DIR = MEDIA_DIR / ".uploads"
+
+_media_executor: Optional[ProcessPoolExecutor] = None
+
+def _executor() -> ProcessPoolExecutor:
+    global _media_executor
+    if _media_executor is None:
+        # Created on first upload: most workers never process an image.
+        # spawn: forking a process that runs an event loop and threads is unsafe
+        _media_executor = ProcessPoolExecutor(
+            max_workers=MEDIA_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _media_executor
+
+def shutdown_media_executor() -> None:
+    global _media_executor
+    if _media_executor is not None:
+        _media_executor.shutdown(wait=False, cancel_futures=True)
+        _media_executor = None
+
+async def save_upload(chunks: AsyncIterator[bytes]) -> Tuple[Path, str]:
+    """Stream an upload to a temporary file; returns its path and SHA-256"""
+    UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(dir=UPLOADS_DIR, delete=False) as tmp:
+        path = Path(tmp.name)
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > MEDIA_MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Imagem maior que {MEDIA_MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
+                    )
+                digest.update(chunk)
+                tmp.write(chunk)
+        except BaseException:
+            tmp.close()
+            path.unlink(missing_ok=True)
+            raise
+    if size == 0:
+        path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nenhum arquivo enviado"
+        )
+    return path, digest.hexdigest()
+
+async def create_media(chunks: AsyncIterator[bytes], alt: str) -> dict:
+    """Store an uploaded image and its variants; returns the `media` entry of a news item"""
+    global _media_executor
+    path, digest = await save_upload(chunks)
+    try:
+        variants = await asyncio.get_running_loop().run_in_executor(
+            _executor(), make_variants, str(path), str(MEDIA_DIR), MEDIA_WIDTHS, MEDIA_MAX_PIXELS
+        )
+    except InvalidImageError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Imagem inválida: {e}"
+        )
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory); start a fresh pool on the next upload
+        _media_executor = None
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Não foi possível processar a imagem. Tente novamente.",
+            headers={"Retry-After": "5"},
+        )
+    finally:
+        path.unlink(missing_ok=True)
+
+    for variant in variants:
+        variant["url"] = MEDIA_URL + variant.pop("path")
+    return {"id": digest, "alt": alt, "variants": variants}
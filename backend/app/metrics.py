@@ -0,0 +1,299 @@
+"""
+Métricas da aplicação no formato de texto do Prometheus (GET /api/metrics)
+
+Coletadas por processo (cada worker do uvicorn tem as suas):
+  - latência e respostas por rota/status
+  - comandos SQL e tempo no banco por requisição
+  - pool de conexões: em uso, overflow e espera por uma conexão
+  - rejeições de rate limit, fila do bcrypt e caches em memória
+Todas as atualizações acontecem na thread do event loop, então os contadores
+são simples variáveis Python, sem locks no caminho das requisições.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import hmac
+import os
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request, status
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+load_dotenv()
+
+# When set, GET /api/metrics requires "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Label for requests that matched no route (404s), to keep label cardinality bounded
+UNMATCHED_ROUTE = "unmatched"
+
+class Histogram:
+    """Prometheus-style histogram with fixed upper bounds"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+LabelKey = Tuple[str, ...]
+
+_request_seconds: Dict[LabelKey, Histogram] = {}
+_request_statements: Dict[LabelKey, Histogram] = {}
+_request_db_seconds: Dict[LabelKey, Histogram] = {}
+_responses: Dict[LabelKey, int] = defaultdict(int)
+_rate_limited: Dict[LabelKey, int] = defaultdict(int)
+_db_statements = 0
+_db_seconds = 0.0
+_pool_wait: Dict[str, Histogram] = {}
+_pool_timeouts: Dict[str, int] = defaultdict(int)
+_hash_seconds = Histogram(LATENCY_BUCKETS)
+_hash_rejected = 0
+_engines: Dict[str, object] = {}
+_caches: Dict[str, object] = {}
+_gauges: List[Tuple[str, str, Callable[[], float]]] = []
+_counters: List[Tuple[str, str, Callable[[], float]]] = []
+
+# [statements, seconds] of the request being handled, set by MetricsMiddleware.
+# SQLAlchemy runs the cursor events in a greenlet that shares this context.
+_request_db: ContextVar[Optional[list]] = ContextVar("request_db", default=None)
+
+def _histogram(family: Dict[LabelKey, Histogram], key: LabelKey, buckets: Sequence[float]) -> Histogram:
+    histogram = family.get(key)
+    if histogram is None:
+        histogram = family[key] = Histogram(buckets)
+    return histogram
+
+def route_label(scope: dict) -> str:
+    """Path template of the matched route (e.g. /api/news/{news_id})"""
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+def observe_request(method: str, route: str, status_code: int, seconds: float, db_usage: list) -> None:
+    key = (method, route)
+    _histogram(_request_seconds, key, LATENCY_BUCKETS).observe(seconds)
+    _histogram(_request_statements, key, STATEMENT_BUCKETS).observe(db_usage[0])
+    _histogram(_request_db_seconds, key, LATENCY_BUCKETS).observe(db_usage[1])
+    _responses[(method, route, str(status_code))] += 1
+
+def record_rate_limited(request: Request) -> None:
+    _rate_limited[(request.method, route_label(request.scope))] += 1
+
+def observe_password_hash(seconds: float) -> None:
+    _hash_seconds.observe(seconds)
+
+def record_password_hash_rejected() -> None:
+    global _hash_rejected
+    _hash_rejected += 1
+
+def register_cache(name: str, cache) -> None:
+    """Export hits, misses and size of a TTLCache"""
+    _caches[name] = cache
+
+def register_gauge(name: str, help_text: str, read: Callable[[], float]) -> None:
+    """Export a gauge whose value is read at scrape time"""
+    _gauges.append((name, help_text, read))
+
+def register_counter(name: str, help_text: str, read: Callable[[], float]) -> None:
+    """Export a counter (a value that only increases) read at scrape time; name ends in _total"""
+    _counters.append((name, help_text, read))
+
+class MetricsMiddleware:
+    """ASGI middleware timing each HTTP request and counting its SQL statements"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        db_usage = [0, 0.0]
+        token = _request_db.set(db_usage)
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - start
+            _request_db.reset(token)
+            observe_request(scope["method"], route_label(scope), status_code, elapsed, db_usage)
+
+def timed_queue_pool(name: str) -> type:
+    """AsyncAdaptedQueuePool subclass that records how long each checkout waits"""
+    wait = _pool_wait.setdefault(name, Histogram(POOL_WAIT_BUCKETS))
+
+    # A subclass per pool name, since Pool.recreate() (engine.dispose) rebuilds
+    # the pool from its class without any extra state
+    class TimedQueuePool(AsyncAdaptedQueuePool):
+        def _do_get(self):
+            start = perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                _pool_timeouts[name] += 1
+                raise
+            finally:
+                wait.observe(perf_counter() - start)
+
+    return TimedQueuePool
+
+def instrument_engine(engine, name: str) -> None:
+    """Count statements and time spent in the database, and export the engine's pool gauges"""
+    _engines[name] = engine
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["metrics_statement_start"] = perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        global _db_statements, _db_seconds
+        elapsed = perf_counter() - conn.info.pop("metrics_statement_start", perf_counter())
+        _db_statements += 1
+        _db_seconds += elapsed
+        usage = _request_db.get()
+        if usage is not None:
+            usage[0] += 1
+            usage[1] += elapsed
+
+def check_metrics_token(request: Request) -> None:
+    """Reject the scrape unless it carries METRICS_TOKEN (when configured)"""
+    if not METRICS_TOKEN:
+        return
+    authorization = request.headers.get("authorization", "")
+    if not hmac.compare_digest(authorization.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Não autenticado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+def _render_histograms(
+    lines: List[str],
+    name: str,
+    help_text: str,
+    label_names: Sequence[str],
+    family: Dict[LabelKey, Histogram],
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in sorted(family.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            labels = _labels((*label_names, "le"), (*key, _format_bound(bound)))
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _labels((*label_names, "le"), (*key, "+Inf"))
+        lines.append(f"{name}_bucket{labels} {histogram.count}")
+        lines.append(f"{name}_sum{_labels(label_names, key)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(label_names, key)} {histogram.count}")
+
+def _render_samples(
+    lines: List[str],
+    name: str,
+    metric_type: str,
+    help_text: str,
+    label_names: Sequence[str],
+    samples: Dict[LabelKey, float],
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {metric_type}")
+    for key, value in sorted(samples.items()):
+        lines.append(f"{name}{_labels(label_names, key)} {value}")
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines: List[str] = []
+    route_labels = ("method", "route")
+
+    _render_histograms(lines, "semear_http_request_duration_seconds",
+                       "Tempo de resposta por rota.", route_labels, _request_seconds)
+    _render_samples(lines, "semear_http_responses_total", "counter",
+                    "Respostas por rota e status.", (*route_labels, "status"), _responses)
+    _render_histograms(lines, "semear_http_request_db_statements",
+                       "Comandos SQL executados por requisição.", route_labels, _request_statements)
+    _render_histograms(lines, "semear_http_request_db_seconds",
+                       "Tempo no banco de dados por requisição.", route_labels, _request_db_seconds)
+    _render_samples(lines, "semear_rate_limit_rejections_total", "counter",
+                    "Requisições recusadas pelo rate limit.", route_labels, _rate_limited)
+
+    _render_samples(lines, "semear_db_statements_total", "counter",
+                    "Comandos SQL executados.", (), {(): _db_statements})
+    _render_samples(lines, "semear_db_statement_seconds_total", "counter",
+                    "Tempo total gasto em comandos SQL.", (), {(): _db_seconds})
+
+    checked_out, overflow, size = {}, {}, {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            checked_out[(name,)] = pool.checkedout()
+            # QueuePool counts overflow from -pool_size until the pool is full
+            overflow[(name,)] = max(pool.overflow(), 0)
+            size[(name,)] = pool.size()
+    _render_samples(lines, "semear_db_pool_checked_out", "gauge",
+                    "Conexões em uso.", ("pool",), checked_out)
+    _render_samples(lines, "semear_db_pool_overflow", "gauge",
+                    "Conexões abertas além de pool_size.", ("pool",), overflow)
+    _render_samples(lines, "semear_db_pool_size", "gauge",
+                    "Tamanho configurado do pool.", ("pool",), size)
+    _render_histograms(lines, "semear_db_pool_wait_seconds",
+                       "Espera para obter uma conexão do pool.", ("pool",),
+                       {(name,): histogram for name, histogram in _pool_wait.items()})
+    _render_samples(lines, "semear_db_pool_timeouts_total", "counter",
+                    "Esperas por conexão que estouraram o timeout do pool.", ("pool",),
+                    {(name,): _pool_timeouts[name] for name in _pool_wait})
+
+    _render_histograms(lines, "semear_password_hash_seconds",
+                       "Duração das operações de bcrypt, incluindo a fila do pool.", (), {(): _hash_seconds})
+    _render_samples(lines, "semear_password_hash_rejections_total", "counter",
+                    "Operações de bcrypt recusadas por fila cheia (503).", (), {(): _hash_rejected})
+
+    cache_stats = {name: cache.stats() for name, cache in _caches.items()}
+    _render_samples(lines, "semear_cache_hits_total", "counter", "Acertos do cache em memória.",
+                    ("cache",), {(name,): stats["hits"] for name, stats in cache_stats.items()})
+    _render_samples(lines, "semear_cache_misses_total", "counter", "Faltas do cache em memória.",
+                    ("cache",), {(name,): stats["misses"] for name, stats in cache_stats.items()})
+    _render_samples(lines, "semear_cache_entries", "gauge", "Entradas no cache em memória.",
+                    ("cache",), {(name,): stats["size"] for name, stats in cache_stats.items()})
+
+    for name, help_text, read in _gauges:
+        _render_samples(lines, name, "gauge", help_text, (), {(): read()})
+    for name, help_text, read in _counters:
+        _render_samples(lines, name, "counter", help_text, (), {(): read()})
+
+    lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,129 @@
+"""
+Migrações versionadas do esquema
+
+Cada migração tem um número crescente e uma função síncrona executada com a
+conexão (via run_sync). A última versão aplicada fica na tabela
+schema_version. As migrações são aplicadas uma única vez, por
+`python -m app.bootstrap`; os workers da API apenas conferem a versão ao iniciar.
+
+Como as tabelas são criadas a partir dos modelos atuais, cada migração deve
+ser idempotente (checkfirst / IF NOT EXISTS): em um banco novo todas rodam em
+sequência, e em um banco anterior às migrações parte do esquema já existe.
+Nunca altere uma migração já publicada; acrescente uma nova ao fim da lista.
+"""
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import delete, insert, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app.database import (
+    engine, AdminUser, Contact, News, NewsArchive, NewsChange, RevokedToken, SchemaVersion
+)
+from app.archive import rebuild_archive
+from app.search import setup_search
+
+# Any constant works; it only has to be the same for every bootstrap
+BOOTSTRAP_LOCK_ID = 735_201_401
+
+def _create_tables(conn: Connection, *models) -> None:
+    """Create the tables of models, and any index missing on existing ones"""
+    for model in models:
+        model.__table__.create(conn, checkfirst=True)
+        # create(checkfirst=True) skips the indexes of a table that already exists
+        for index in model.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+def _initial_schema(conn: Connection) -> None:
+    _create_tables(conn, News, Contact, AdminUser)
+    setup_search(conn)
+
+def _add_news_media(conn: Connection) -> None:
+    columns = {column["name"] for column in inspect(conn).get_columns("news")}
+    if "media" not in columns:
+        conn.execute(text("ALTER TABLE news ADD COLUMN media JSON NOT NULL DEFAULT '[]'"))
+
+def _create_news_changes(conn: Connection) -> None:
+    if inspect(conn).has_table(NewsChange.__tablename__):
+        return
+    _create_tables(conn, NewsChange)
+    # Existing news are the first entries of the feed, so `since=0` is a full sync
+    conn.execute(
+        insert(NewsChange).from_select(
+            ["news_id"], select(News.id).order_by(News.date, News.id)
+        )
+    )
+
+def _create_news_archive(conn: Connection) -> None:
+    _create_tables(conn, NewsArchive)
+    rebuild_archive(conn)
+
+def _create_revoked_tokens(conn: Connection) -> None:
+    _create_tables(conn, RevokedToken)
+
+def _add_news_changes_changed_at(conn: Connection) -> None:
+    columns = {column["name"] for column in inspect(conn).get_columns("news_changes")}
+    if "changed_at" not in columns:
+        column_type = NewsChange.__table__.c.changed_at.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE news_changes ADD COLUMN changed_at {column_type}"))
+
+def _add_contacts_version(conn: Connection) -> None:
+    columns = {column["name"] for column in inspect(conn).get_columns("contacts")}
+    if "version" not in columns:
+        conn.execute(text("ALTER TABLE contacts ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "tabelas iniciais, índice (date, id) e busca textual", _initial_schema),
+    (2, "coluna news.media com as imagens das notícias", _add_news_media),
+    (3, "tabela news_changes com o histórico de alterações", _create_news_changes),
+    (4, "tabela news_archive com a contagem de notícias por mês", _create_news_archive),
+    (5, "tabela revoked_tokens com os tokens encerrados por logout", _create_revoked_tokens),
+    (6, "coluna news_changes.changed_at para o Last-Modified", _add_news_changes_changed_at),
+    (7, "coluna contacts.version para o cache de /api/site", _add_contacts_version),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+class SchemaOutdatedError(RuntimeError):
+    pass
+
+def _current_version(conn: Connection) -> Optional[int]:
+    if not inspect(conn).has_table(SchemaVersion.__tablename__):
+        return None
+    return conn.scalar(select(SchemaVersion.version)) or 0
+
+def _apply(conn: Connection) -> Tuple[int, int]:
+    if conn.dialect.name == "postgresql":
+        # Serializes concurrent bootstraps; released at the end of the transaction
+        conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": BOOTSTRAP_LOCK_ID})
+    SchemaVersion.__table__.create(conn, checkfirst=True)
+    start = current = _current_version(conn) or 0
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        print(f"Aplicando migração {version}: {description}")
+        migrate(conn)
+        current = version
+    if current != start:
+        conn.execute(delete(SchemaVersion))
+        conn.execute(insert(SchemaVersion).values(version=current))
+    return start, current
+
+async def migrate(bind=engine) -> Tuple[int, int]:
+    """Apply pending migrations in one transaction; returns (previous, current) versions"""
+    async with bind.begin() as conn:
+        return await conn.run_sync(_apply)
+
+async def check_schema(bind=engine) -> int:
+    """Fail fast if the database hasn't been migrated to LATEST_VERSION"""
+    async with bind.connect() as conn:
+        try:
+            version = await conn.scalar(select(SchemaVersion.version))
+        except DBAPIError:
+            # No schema_version table: the database was never bootstrapped
+            version = None
+    if version is None or version < LATEST_VERSION:
+        raise SchemaOutdatedError(
+            f"Esquema do banco na versão {version}, esperada {LATEST_VERSION}. "
+            "Execute `python -m app.bootstrap` antes de iniciar a API."
+        )
+    return version
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator
-from datetime import date as date_type
-from typing import Optional
+from datetime import date as date_type, datetime
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
 class NewsBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255, description="Título da notícia")
@@ -52,12 +52,117 @@ class NewsUpdate(BaseModel):
             return v.strip()
         return v
 
+class NewsMediaVariant(BaseModel):
+    url: str
+    format: str
+    width: int
+    height: int
+
+class NewsMedia(BaseModel):
+    """Imagem de uma notícia: o id é o SHA-256 do arquivo enviado"""
+    id: str
+    alt: str = ""
+    variants: List[NewsMediaVariant]
+
 class NewsResponse(NewsBase):
     id: int
+    media: List[NewsMedia] = []
     
     class Config:
         from_attributes = True
 
+class NewsSummaryResponse(BaseModel):
+    """Projeção parcial de uma notícia: apenas os campos solicitados são enviados"""
+    id: int
+    title: Optional[str] = None
+    excerpt: Optional[str] = None
+    content: Optional[str] = None
+    date: Optional[date_type] = None
+    media: Optional[List[NewsMedia]] = None
+
+    class Config:
+        from_attributes = True
+
+class NewsImportError(BaseModel):
+    line: int
+    error: str
+
+class NewsImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[NewsImportError]
+
+class NewsBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    changes: NewsUpdate
+
+class NewsBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+NewsBatchOperation = Annotated[Union[NewsBatchUpdate, NewsBatchDelete], Field(discriminator="op")]
+
+class NewsBatchRequest(BaseModel):
+    # Validated one by one (NewsBatchOperation), so an invalid operation is
+    # reported in its result instead of rejecting the whole batch
+    operations: List[Dict[str, Any]] = Field(..., min_length=1, max_length=500)
+
+class NewsBatchItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    op: Optional[str] = None
+    status: Literal["updated", "deleted", "not_found", "invalid"]
+    error: Optional[str] = None
+
+class NewsBatchResult(BaseModel):
+    updated: int
+    deleted: int
+    failed: int
+    results: List[NewsBatchItemResult]
+
+class NewsArchiveMonth(BaseModel):
+    year: int
+    month: int
+    count: int
+
+class NewsChangesResponse(BaseModel):
+    """Alterações depois de uma versão do feed: notícias no estado atual e ids removidos"""
+    version: int
+    changes: List[NewsResponse]
+    deleted: List[int]
+    has_more: bool
+
+class ContactBase(BaseModel):
+    email: EmailStr = Field(..., description="E-mail de contato")
+    phone: str = Field(..., min_length=1, max_length=50, description="Telefone de contato")
+
+    @field_validator('phone')
+    @classmethod
+    def validate_phone(cls, v):
+        if not v or len(v.strip()) == 0:
+            raise ValueError('Telefone não pode estar vazio')
+        return v.strip()
+
+class ContactUpdate(ContactBase):
+    pass
+
+class ContactResponse(ContactBase):
+    class Config:
+        from_attributes = True
+
+class SiteInfo(BaseModel):
+    name: str
+    description: str
+
+class SiteResponse(BaseModel):
+    """Dados da primeira carga do site em uma única resposta"""
+    site: SiteInfo
+    contact: Optional[ContactResponse] = None
+    news: List[NewsSummaryResponse]
+    news_next_cursor: Optional[str] = None
+    news_version: int
+
 class LoginRequest(BaseModel):
     email: EmailStr = Field(..., description="E-mail do administrador")
     password: str = Field(..., min_length=1, description="Senha do administrador")
@@ -80,3 +185,9 @@ class TokenResponse(BaseModel):
     message: str
     user_email: str
 
+
+class ProfileInfo(BaseModel):
+    """Perfil de requisição gravado (collapsed stacks)"""
+    name: str
+    size: int
+    created_at: datetime
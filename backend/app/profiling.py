@@ -0,0 +1,181 @@
+"""
+Perfil de requisições sob demanda
+
+Com PROFILING_ENABLED=true, uma requisição é perfilada quando:
+  - traz o cabeçalho `X-Profile: 1` e um token de administrador válido; ou
+  - é sorteada, com probabilidade PROFILING_SAMPLE_RATE.
+Uma thread amostra a pilha do event loop a cada PROFILING_INTERVAL_SECONDS
+enquanto a requisição roda, e o resultado é gravado em PROFILING_DIR no
+formato "collapsed stacks" (uma pilha por linha, `a;b;c contagem`), aceito
+pelo flamegraph.pl e pelo speedscope. Só os PROFILING_MAX_FILES perfis mais
+recentes são mantidos. O nome do arquivo vai no cabeçalho X-Profile-Id e os
+perfis são listados e baixados em /api/profiles (requer autenticação).
+
+Cada worker perfila uma requisição por vez; como o event loop é compartilhado,
+as amostras incluem o que as requisições simultâneas estiverem fazendo.
+Desativado, o custo por requisição é uma verificação de um booleano.
+"""
+from collections import Counter
+from datetime import datetime, timezone
+from http.cookies import SimpleCookie
+from pathlib import Path
+from typing import Dict, List, Optional
+import asyncio
+import os
+import random
+import re
+import sys
+import threading
+from dotenv import load_dotenv
+
+from app.auth import verify_token
+
+load_dotenv()
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_DIR = Path(os.getenv("PROFILING_DIR", "profiles"))
+PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", "50"))
+PROFILING_INTERVAL_SECONDS = float(os.getenv("PROFILING_INTERVAL_SECONDS", "0.001"))
+# Long responses (e.g. SSE streams) are only sampled for this long
+PROFILING_MAX_SECONDS = float(os.getenv("PROFILING_MAX_SECONDS", "30"))
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_NAME = re.compile(r"^[\w.-]+\.collapsed$")
+
+class StackSampler:
+    """Samples the stack of one thread from a background thread"""
+
+    def __init__(self, thread_id: int, interval: float, max_seconds: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_samples = max(1, int(max_seconds / interval))
+        self.stacks: Counter = Counter()
+        self._labels: Dict[object, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        # The sampled thread only gives up the GIL every switch interval, which
+        # would otherwise cap the sampling rate (5ms by default)
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+        return label
+
+    def _sample(self) -> None:
+        samples = 0
+        while not self._stop.wait(self.interval) and samples < self.max_samples:
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                # Root first; ";" separates frames in the collapsed format
+                self.stacks[";".join(reversed(stack))] += 1
+                samples += 1
+
+    def collapsed(self) -> bytes:
+        lines = [f"{stack} {count}" for stack, count in sorted(self.stacks.items())]
+        return ("\n".join(lines) + "\n").encode() if lines else b""
+
+def _is_admin(scope: dict) -> bool:
+    """Whether the request carries a valid admin token (cookie or Bearer)"""
+    token = None
+    for name, value in scope["headers"]:
+        if name == b"authorization" and value[:7].lower() == b"bearer ":
+            token = value[7:].decode("latin-1")
+        elif name == b"cookie" and token is None:
+            morsel = SimpleCookie(value.decode("latin-1")).get("access_token")
+            token = morsel.value if morsel else None
+    payload = verify_token(token) if token else None
+    return bool(payload and payload.get("sub"))
+
+def _wants_profile(scope: dict) -> bool:
+    if scope["path"].startswith("/api/profiles"):
+        return False
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER and value not in (b"", b"0"):
+            return _is_admin(scope)
+    return PROFILING_SAMPLE_RATE > 0 and random.random() < PROFILING_SAMPLE_RATE
+
+def _profile_name(scope: dict) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    path = re.sub(r"[^\w-]+", "_", scope["path"].strip("/")) or "root"
+    return f"{stamp}-{os.getpid()}-{scope['method']}-{path[:80]}.collapsed"
+
+def _save_profile(name: str, data: bytes) -> None:
+    PROFILING_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = PROFILING_DIR / f".{name}.tmp"
+    tmp.write_bytes(data)
+    os.replace(tmp, PROFILING_DIR / name)
+    # Ring buffer: names start with the timestamp, so the oldest sort first
+    for old in sorted(PROFILING_DIR.glob("*.collapsed"))[:-max(PROFILING_MAX_FILES, 1)]:
+        old.unlink(missing_ok=True)
+
+def list_profiles() -> List[dict]:
+    """Saved profiles, newest first"""
+    if not PROFILING_DIR.is_dir():
+        return []
+    profiles = []
+    for path in sorted(PROFILING_DIR.glob("*.collapsed"), reverse=True):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        profiles.append({
+            "name": path.name,
+            "size": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+        })
+    return profiles
+
+def profile_path(name: str) -> Optional[Path]:
+    """Path of a saved profile, or None for unknown or invalid names"""
+    if not PROFILE_NAME.match(name):
+        return None
+    path = PROFILING_DIR / name
+    return path if path.is_file() else None
+
+class ProfilingMiddleware:
+    """ASGI middleware sampling the event loop stack of selected requests"""
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope, receive, send):
+        if not PROFILING_ENABLED or scope["type"] != "http" or self._busy or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        name = _profile_name(scope)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", name.encode())]
+            await send(message)
+
+        self._busy = True
+        sampler = StackSampler(threading.get_ident(), PROFILING_INTERVAL_SECONDS, PROFILING_MAX_SECONDS)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            await asyncio.to_thread(sampler.stop)
+            self._busy = False
+            try:
+                await asyncio.to_thread(_save_profile, name, sampler.collapsed())
+            except OSError as e:
+                print(f"Erro ao gravar perfil {name}: {e}")
@@ -0,0 +1,243 @@
+"""
+Pré-renderização das notícias em arquivos JSON estáticos
+
+Depois de cada escrita em notícias, atualiza em STATIC_NEWS_DIR/news/:
+  - index.json          -> mesmo conteúdo de GET /api/news, enquanto couber em uma
+                           página (sem X-Next-Cursor); com mais notícias o arquivo
+                           é removido e a listagem volta a ser atendida pelo backend
+  - month/{AAAA-MM}.json -> as notícias de cada mês, na ordem da listagem
+  - {id}.json           -> mesmo conteúdo de GET /api/news/{id}
+para que o nginx sirva as leituras públicas direto do disco.
+Cada escrita atualiza apenas o índice, os meses afetados e as notícias alteradas.
+Cada arquivo é escrito em um temporário e renomeado (troca atômica).
+As escritas da API são publicadas pela fila de tarefas (schedule_publish),
+depois do commit: uma rajada de edições gera uma única publicação.
+Uma publicação por vez, mesmo entre workers (trava em
+STATIC_NEWS_DIR/.publish.lock), da leitura do banco até a troca dos arquivos:
+uma publicação que leu o banco antes de outra não sobrescreve arquivos mais novos.
+
+Reconstrução completa a partir do banco (no diretório backend):
+    python -m app.publisher
+"""
+from datetime import date as date_type
+from pathlib import Path
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+import asyncio
+import os
+import tempfile
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+from dotenv import load_dotenv
+from sqlalchemy import select
+
+from app.database import SessionLocal, News
+from app.jobs import jobs
+from app.serializers import dump_json, news_to_dict
+
+load_dotenv()
+
+# Publishing is disabled unless a directory is configured
+STATIC_NEWS_DIR = os.getenv("STATIC_NEWS_DIR")
+# Matches the default `limit` of GET /api/news
+INDEX_SIZE = 100
+REBUILD_BATCH_SIZE = 1000
+
+COLUMNS = (News.title, News.excerpt, News.content, News.date, News.media, News.id)
+ORDER = (News.date.desc(), News.id.desc())
+
+# One publish at a time, so a slower publish (one that read the database
+# before another's commit) can't overwrite a newer one: an asyncio lock within
+# the worker and a file lock in STATIC_NEWS_DIR across workers
+_publish_lock = asyncio.Lock()
+LOCK_FILE = ".publish.lock"
+LOCK_POLL_SECONDS = 0.05
+
+@asynccontextmanager
+async def _publishing(root: Path) -> AsyncIterator[None]:
+    """Hold the publish locks around reading the database and writing the files"""
+    async with _publish_lock:
+        if fcntl is None:
+            # Windows (development only): one worker, the asyncio lock is enough
+            yield
+            return
+        root.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(root.parent / LOCK_FILE, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            # Non-blocking attempts keep the event loop free and the wait cancellable
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(LOCK_POLL_SECONDS)
+            yield
+        finally:
+            # Closing the descriptor releases the lock
+            os.close(fd)
+
+def _news_dir() -> Optional[Path]:
+    return Path(STATIC_NEWS_DIR) / "news" if STATIC_NEWS_DIR else None
+
+def _month(news_date: date_type) -> str:
+    return f"{news_date.year:04d}-{news_date.month:02d}"
+
+def _month_range(month: str):
+    year, month_number = (int(part) for part in month.split("-"))
+    first = date_type(year, month_number, 1)
+    following = date_type(year + month_number // 12, month_number % 12 + 1, 1)
+    return first, following
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    # Unique temporary name, so concurrent writers never share a file
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as tmp:
+        tmp.write(data)
+    # NamedTemporaryFile creates 0600 files; nginx runs as another user
+    os.chmod(tmp.name, 0o644)
+    os.replace(tmp.name, path)
+
+def _write_files(root: Path, files: Dict[str, Optional[bytes]]) -> None:
+    """Write every file; a None value removes the file"""
+    (root / "month").mkdir(parents=True, exist_ok=True)
+    for name, data in files.items():
+        if data is None:
+            (root / name).unlink(missing_ok=True)
+        else:
+            _atomic_write(root / name, data)
+
+def _prune(root: Path, item_ids: Set[int], months: Set[str]) -> None:
+    """Remove files of news items and months that no longer exist"""
+    for item in root.glob("*.json"):
+        if item.stem.isdigit() and int(item.stem) not in item_ids:
+            item.unlink(missing_ok=True)
+    for shard in (root / "month").glob("*.json"):
+        if shard.stem not in months:
+            shard.unlink(missing_ok=True)
+
+async def _index_file(db) -> Optional[bytes]:
+    rows = await db.execute(select(*COLUMNS).order_by(*ORDER).limit(INDEX_SIZE + 1))
+    items = [news_to_dict(row) for row in rows]
+    # A longer list needs the X-Next-Cursor header, which only the backend sends
+    return dump_json(items) if len(items) <= INDEX_SIZE else None
+
+async def _month_file(db, month: str) -> Optional[bytes]:
+    first, following = _month_range(month)
+    rows = await db.execute(
+        select(*COLUMNS)
+        .where(News.date >= first, News.date < following)
+        .order_by(*ORDER)
+    )
+    items = [news_to_dict(row) for row in rows]
+    return dump_json(items) if items else None
+
+async def publish_news(
+    changed_ids: Iterable[int] = (),
+    deleted_ids: Iterable[int] = (),
+    dates: Iterable[date_type] = (),
+) -> None:
+    """Rewrite the index, the changed news items and their months
+
+    `dates` are the previous dates of updated or deleted items, whose month
+    files must also be refreshed.
+    """
+    root = _news_dir()
+    if root is None:
+        return
+    changed = set(changed_ids)
+    months = {_month(news_date) for news_date in dates}
+    async with _publishing(root):
+        async with SessionLocal() as db:
+            files: Dict[str, Optional[bytes]] = {"index.json": await _index_file(db)}
+            if changed:
+                rows = await db.execute(select(*COLUMNS).where(News.id.in_(changed)))
+                for row in rows:
+                    item = news_to_dict(row)
+                    files[f"{item['id']}.json"] = dump_json(item)
+                    months.add(_month(row.date))
+            for news_id in deleted_ids:
+                files[f"{news_id}.json"] = None
+            for month in months:
+                files[f"month/{month}.json"] = await _month_file(db, month)
+        await asyncio.to_thread(_write_files, root, files)
+
+# Writes waiting for the "publish-news" job; a burst of edits is published once
+_pending: Dict[str, Any] = {"changed": set(), "deleted": set(), "dates": set(), "rebuild": False}
+
+def schedule_publish(
+    changed_ids: Iterable[int] = (),
+    deleted_ids: Iterable[int] = (),
+    dates: Iterable[date_type] = (),
+    rebuild: bool = False,
+) -> None:
+    """Publish the given writes from the background job queue (app/jobs.py)"""
+    if _news_dir() is None:
+        return
+    _pending["changed"].update(changed_ids)
+    _pending["deleted"].update(deleted_ids)
+    _pending["dates"].update(dates)
+    _pending["rebuild"] = _pending["rebuild"] or rebuild
+    jobs.submit("publish-news", _publish_pending)
+
+async def _publish_pending() -> None:
+    changed, deleted, dates, rebuild = (
+        _pending["changed"], _pending["deleted"], _pending["dates"], _pending["rebuild"]
+    )
+    _pending.update(changed=set(), deleted=set(), dates=set(), rebuild=False)
+    try:
+        if rebuild:
+            await rebuild_all()
+        else:
+            await publish_news(changed, deleted, dates)
+    except Exception:
+        # Put the work back, so the retry also covers it
+        _pending["changed"].update(changed)
+        _pending["deleted"].update(deleted)
+        _pending["dates"].update(dates)
+        _pending["rebuild"] = _pending["rebuild"] or rebuild
+        raise
+
+async def rebuild_all() -> int:
+    """Rewrite every static file from the database; returns the number of news items"""
+    root = _news_dir()
+    if root is None:
+        return 0
+    item_ids: Set[int] = set()
+    months: Set[str] = set()
+    async with _publishing(root):
+        async with SessionLocal() as db:
+            files: Dict[str, Optional[bytes]] = {"index.json": await _index_file(db)}
+            month_items: List[dict] = []
+            month = None
+            result = await db.stream(
+                select(*COLUMNS).order_by(*ORDER).execution_options(yield_per=REBUILD_BATCH_SIZE)
+            )
+            # Rows arrive grouped by month, so only one month is held in memory
+            async for row in result:
+                row_month = _month(row.date)
+                if row_month != month:
+                    if month_items:
+                        files[f"month/{month}.json"] = dump_json(month_items)
+                    month, month_items = row_month, []
+                    months.add(month)
+                item = news_to_dict(row)
+                month_items.append(item)
+                item_ids.add(item["id"])
+                files[f"{item['id']}.json"] = dump_json(item)
+                if len(files) >= REBUILD_BATCH_SIZE:
+                    await asyncio.to_thread(_write_files, root, files)
+                    files = {}
+            if month_items:
+                files[f"month/{month}.json"] = dump_json(month_items)
+        await asyncio.to_thread(_write_files, root, files)
+        await asyncio.to_thread(_prune, root, item_ids, months)
+    return len(item_ids)
+
+if __name__ == "__main__":
+    if _news_dir() is None:
+        raise SystemExit("STATIC_NEWS_DIR não configurado")
+    total = asyncio.run(rebuild_all())
+    print(f"{total} notícias publicadas em {_news_dir()}")
@@ -0,0 +1,111 @@
+"""
+Revogação de tokens de acesso (logout no servidor)
+
+Todo token tem um identificador (`jti`). No logout, o jti é gravado em
+revoked_tokens com a expiração do token. Cada worker mantém os jtis revogados
+em um conjunto em memória, carregado ao iniciar e atualizado a cada
+REVOCATION_REFRESH_SECONDS apenas com as linhas novas (id maior que o último
+lido), então conferir um token não consulta o banco. Um logout vale na hora
+no worker que o atendeu e em até REVOCATION_REFRESH_SECONDS nos demais.
+
+Depois que o token expira, a assinatura já o recusa: as entradas expiradas
+saem da memória e do banco a cada REVOCATION_PRUNE_SECONDS.
+"""
+from typing import Dict, Optional
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal, RevokedToken, UPSERTS
+from app.metrics import register_gauge
+
+load_dotenv()
+
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "1"))
+REVOCATION_PRUNE_SECONDS = float(os.getenv("REVOCATION_PRUNE_SECONDS", "3600"))
+
+class RevocationSet:
+    """In-memory copy of revoked_tokens, refreshed incrementally"""
+
+    def __init__(self):
+        # jti -> expiration (Unix time)
+        self.revoked: Dict[str, int] = {}
+        self.last_id = 0
+        self._next_prune = 0.0
+        self._poller: Optional[asyncio.Task] = None
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self.revoked
+
+    async def revoke(self, db: AsyncSession, jti: str, expires_at: int) -> None:
+        """Revoke jti in the current transaction; this worker sees it at once"""
+        if db.bind.dialect.name == "postgresql":
+            # Ids must become visible in order, or a worker that already read a
+            # higher id would never load this one. SQLite already serializes writers.
+            await db.execute(text("LOCK TABLE revoked_tokens IN EXCLUSIVE MODE"))
+        # Logging out twice with the same token is not an error
+        await db.execute(
+            UPSERTS[db.bind.dialect.name](RevokedToken)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+        self.revoked[jti] = expires_at
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Load the rows added since the last refresh"""
+        rows = (await db.execute(
+            select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+            .where(RevokedToken.id > self.last_id)
+            .order_by(RevokedToken.id)
+        )).all()
+        now = int(time.time())
+        for row in rows:
+            if row.expires_at > now:
+                self.revoked[row.jti] = row.expires_at
+        if rows:
+            self.last_id = rows[-1].id
+
+    async def prune(self, db: AsyncSession) -> None:
+        """Forget revocations of tokens that have expired anyway"""
+        now = int(time.time())
+        self.revoked = {jti: expires_at for jti, expires_at in self.revoked.items() if expires_at > now}
+        await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        await db.commit()
+
+    async def start(self) -> None:
+        async with SessionLocal() as db:
+            await self.refresh(db)
+        self._next_prune = time.monotonic() + REVOCATION_PRUNE_SECONDS
+        self._poller = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+
+    async def _poll(self) -> None:
+        # Logouts handled by other workers only show up in the database
+        while True:
+            await asyncio.sleep(REVOCATION_REFRESH_SECONDS)
+            try:
+                async with SessionLocal() as db:
+                    await self.refresh(db)
+                    if time.monotonic() >= self._next_prune:
+                        self._next_prune = time.monotonic() + REVOCATION_PRUNE_SECONDS
+                        await self.prune(db)
+            except Exception as e:
+                print(f"Erro ao atualizar tokens revogados: {e}")
+
+revocations = RevocationSet()
+register_gauge(
+    "semear_revoked_tokens",
+    "Tokens de acesso revogados e ainda não expirados conhecidos por este worker.",
+    lambda: len(revocations.revoked),
+)
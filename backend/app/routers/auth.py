@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
-from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Cookie, Depends, HTTPException, status, Response, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 import os
 from dotenv import load_dotenv
@@ -8,17 +10,21 @@ from dotenv import load_dotenv
 from app.database import get_db, AdminUser
 from app.models import LoginRequest, TokenResponse
 from app.auth import (
-    verify_password,
+    verify_and_update_password,
+    dummy_verify_password,
     create_access_token,
     get_current_user,
+    request_token,
+    verify_token,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 from app.limiter import limiter
+from app.revocation import revocations
 
 load_dotenv()
 
 router = APIRouter()
-security = HTTPBearer()
+security = HTTPBearer(auto_error=False)
 
 @router.post("/login", response_model=TokenResponse)
 @limiter.limit("5/minute")
@@ -26,7 +32,7 @@ async def login(
     request: Request,
     login_data: LoginRequest,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Autentica um administrador e retorna um token JWT em cookie httponly
@@ -40,20 +46,30 @@ async def login(
         )
     
     # Find user
-    user = db.query(AdminUser).filter(AdminUser.email == login_data.email.lower().strip()).first()
+    user = await db.scalar(
+        select(AdminUser).where(AdminUser.email == login_data.email.lower().strip())
+    )
     
     if not user:
+        # Same bcrypt cost as a real account, so unknown e-mails can't be told apart by timing
+        await dummy_verify_password(login_data.password)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="E-mail ou senha incorretos"
         )
     
     # Verify password
-    if not verify_password(login_data.password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password(login_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="E-mail ou senha incorretos"
         )
+
+    # Upgrade hashes made with an outdated work factor
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -80,11 +96,23 @@ async def login(
 
 @router.post("/logout")
 @limiter.limit("30/minute")
-async def logout(request: Request, response: Response):
+async def logout(
+    request: Request,
+    response: Response,
+    access_token: Optional[str] = Cookie(None, alias="access_token"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_db)
+):
     """
-    Remove o token de autenticação
+    Remove o token de autenticação e o revoga no servidor, para que não seja
+    mais aceito mesmo que uma cópia dele ainda exista
     Rate limit: 30 requisições por minuto
     """
+    token = request_token(access_token, credentials)
+    payload = verify_token(token) if token else None
+    if payload is not None:
+        await revocations.revoke(db, payload["jti"], int(payload["exp"]))
+        await db.commit()
     response.delete_cookie(key="access_token", path="/")
     return {"message": "Logout realizado com sucesso"}
 
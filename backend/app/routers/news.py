@@ -1,55 +1,344 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple, Union
 from datetime import date as date_type
+import base64
+import binascii
 
-from app.database import get_db, News, AdminUser
-from app.models import NewsCreate, NewsUpdate, NewsResponse
+from app.database import get_db, get_read_db, SessionLocal, News, AdminUser
+from app.models import (
+    NewsCreate,
+    NewsUpdate,
+    NewsResponse,
+    NewsSummaryResponse,
+    NewsImportError,
+    NewsImportResult,
+    NewsChangesResponse,
+    NewsArchiveMonth,
+    NewsBatchOperation,
+    NewsBatchRequest,
+    NewsBatchItemResult,
+    NewsBatchResult,
+)
 from app.auth import get_current_user
 from app.limiter import limiter
+from app.cache import news_cache, bump_news_version
+from app.serializers import (
+    NEWS_FIELDS,
+    SUMMARY_FIELDS,
+    dump_json,
+    dump_news_list,
+    dump_news_item,
+    news_to_dict,
+)
+from app.search import search_news
+from app.compression import EncodedBody, encoded_response
+from app.media import create_media
+from app.changes import (
+    NEWS_CHANGES_MAX_STREAMS,
+    broadcaster,
+    load_changes,
+    record_changes,
+)
+from app.archive import adjust_archive, load_archive
+from app.publisher import schedule_publish
+from app.http_cache import news_freshness, schedule_proxy_purge
 
 router = APIRouter()
 
-@router.get("", response_model=List[NewsResponse])
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+EXPORT_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_LINE_BYTES = 1024 * 1024
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+BATCH_OPERATION = TypeAdapter(NewsBatchOperation)
+# Same messages as PUT /api/news/{id} for fields sent as null
+EMPTY_FIELD_MESSAGES = {
+    "title": "Título não pode estar vazio",
+    "excerpt": "Resumo não pode estar vazio",
+    "content": "Conteúdo não pode estar vazio",
+    "date": "Data não pode estar vazia",
+}
+
+def encode_cursor(news_date: date_type, news_id: int) -> str:
+    """Encode the (date, id) position of a news item as an opaque cursor"""
+    raw = f"{news_date.isoformat()}|{news_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[date_type, int]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_date, raw_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return date_type.fromisoformat(raw_date), int(raw_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+
+def parse_fields(fields: Optional[str], view: str) -> Tuple[str, ...]:
+    """Resolve the `fields`/`view` query params into the NewsResponse fields to send"""
+    if not fields:
+        return SUMMARY_FIELDS if view == "summary" else NEWS_FIELDS
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    requested.discard("id")
+    invalid = requested.difference(NEWS_FIELDS)
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campo inválido: {', '.join(sorted(invalid))}"
+        )
+    return tuple(field for field in NEWS_FIELDS if field in requested)
+
+@router.get("", response_model=Union[List[NewsResponse], List[NewsSummaryResponse]])
 @limiter.limit("100/minute")
 async def get_news(
     request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    fields: Optional[str] = Query(None, description="Campos separados por vírgula, ex.: title,excerpt,date"),
+    date_from: Optional[date_type] = Query(None, alias="from", description="Data inicial (inclusive)"),
+    date_to: Optional[date_type] = Query(None, alias="to", description="Data final (inclusive)"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Lista todas as notícias (público)
+    Ordenadas por (data, id) decrescente. Para paginar, envie o valor do
+    cabeçalho X-Next-Cursor da resposta anterior no parâmetro `cursor`
+    (o par `skip`/`limit` continua funcionando).
+    Use `view=summary` (sem o conteúdo completo) ou `fields=` para receber
+    apenas alguns campos; o conteúdo completo fica em GET /api/news/{id}.
+    `from` e `to` (AAAA-MM-DD) limitam o período, ex.: um mês de GET /api/news/archive.
     Rate limit: 100 requisições por minuto
     """
-    news = db.query(News).order_by(News.date.desc()).offset(skip).limit(limit).all()
-    return news
+    selected = parse_fields(fields, view)
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Período inválido: `from` depois de `to`"
+        )
+    freshness = news_freshness(request)
+    not_modified = freshness.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    cache_key = ("list", freshness.version, skip, limit, cursor, selected, date_from, date_to)
+    cached = news_cache.get(cache_key)
+    if cached is None:
+        body, next_cursor = await _load_news_page(
+            db, skip, limit, cursor, selected, date_from, date_to
+        )
+        cached = (EncodedBody(body), next_cursor)
+        news_cache.set(cache_key, cached)
+
+    body, next_cursor = cached
+    headers = dict(freshness.headers)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return await encoded_response(request, body, headers)
+
+async def _load_news_page(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    fields: Tuple[str, ...],
+    date_from: Optional[date_type] = None,
+    date_to: Optional[date_type] = None,
+) -> Tuple[bytes, Optional[str]]:
+    query = select(News).order_by(News.date.desc(), News.id.desc())
+    # Range on the leading column of ix_news_date_id
+    if date_from:
+        query = query.where(News.date >= date_from)
+    if date_to:
+        query = query.where(News.date <= date_to)
+    if fields != NEWS_FIELDS:
+        # Columns that weren't requested (usually `content`) stay deferred;
+        # `date` is always loaded because the next cursor is built from it
+        columns = {getattr(News, field) for field in fields} | {News.date}
+        query = query.options(load_only(*columns))
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(News.date, News.id) < (cursor_date, cursor_id))
+    else:
+        query = query.offset(skip)
+    news = (await db.scalars(query.limit(limit))).all()
+
+    next_cursor = None
+    if limit > 0 and len(news) == limit:
+        next_cursor = encode_cursor(news[-1].date, news[-1].id)
+    return dump_news_list(news, fields), next_cursor
+
+@router.get("/search", response_model=List[NewsResponse])
+@limiter.limit("60/minute")
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Busca notícias por título, resumo e conteúdo, mais relevantes primeiro (público)
+    Rate limit: 60 requisições por minuto
+    """
+    q = q.strip()
+    freshness = news_freshness(request)
+    not_modified = freshness.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    cache_key = ("search", freshness.version, q.lower(), skip, limit)
+    cached = news_cache.get(cache_key)
+    if cached is None:
+        cached = EncodedBody(dump_news_list(await search_news(db, q, skip, limit)) if q else b"[]")
+        news_cache.set(cache_key, cached)
+    return await encoded_response(request, cached, freshness.headers)
+
+@router.get("/export")
+@limiter.limit("10/minute")
+async def export_news(
+    request: Request,
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """
+    Exporta todas as notícias em NDJSON, uma por linha (requer autenticação)
+    Rate limit: 10 requisições por minuto
+    """
+    return StreamingResponse(
+        _export_lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="news.ndjson"'}
+    )
+
+async def _export_lines() -> AsyncIterator[bytes]:
+    # The request session is closed before the body is streamed, so the
+    # export uses its own session and a server-side cursor
+    columns = (News.title, News.excerpt, News.content, News.date, News.media, News.id)
+    async with SessionLocal() as db:
+        result = await db.stream(
+            select(*columns).order_by(News.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            yield b"".join(dump_json(news_to_dict(row)) + b"\n" for row in rows)
+
+@router.get("/archive", response_model=List[NewsArchiveMonth])
+@limiter.limit("100/minute")
+async def get_archive(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Quantidade de notícias por mês, do mais recente ao mais antigo (público)
+    As notícias de um mês vêm de GET /api/news?from=AAAA-MM-01&to=AAAA-MM-{último dia}.
+    Rate limit: 100 requisições por minuto
+    """
+    freshness = news_freshness(request)
+    not_modified = freshness.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    cache_key = ("archive", freshness.version)
+    cached = news_cache.get(cache_key)
+    if cached is None:
+        cached = EncodedBody(dump_json(await load_archive(db)))
+        news_cache.set(cache_key, cached)
+    return await encoded_response(request, cached, freshness.headers)
+
+@router.get("/changes", response_model=NewsChangesResponse)
+@limiter.limit("120/minute")
+async def get_changes(
+    request: Request,
+    since: int = Query(0, ge=0, description="Última versão recebida"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Notícias alteradas depois da versão `since` (público)
+    Cada notícia aparece uma vez, no estado atual; as removidas vêm em
+    `deleted`. Guarde `version` e use-a como `since` na próxima chamada
+    (imediatamente, se `has_more` for verdadeiro). `since=0` traz todas.
+    Rate limit: 120 requisições por minuto
+    """
+    # Always on the primary: versions announced by the stream must already be visible
+    version, changed, deleted, has_more = await load_changes(db, since, limit)
+    body = dump_json({"version": version, "changes": changed, "deleted": deleted, "has_more": has_more})
+    return await encoded_response(request, EncodedBody(body))
+
+@router.get("/changes/stream")
+@limiter.limit("30/minute")
+async def stream_changes(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="Última versão recebida")
+):
+    """
+    Server-sent events com cada nova versão do feed de alterações (público)
+    Envia `event: version` com `{"version": N}`; o cliente então busca
+    GET /api/news/changes?since= com a versão anterior. Na reconexão o
+    EventSource envia Last-Event-ID, que tem prioridade sobre `since`.
+    Rate limit: 30 requisições por minuto
+    """
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        since = int(last_event_id)
+    elif since is None:
+        since = broadcaster.version
+    if broadcaster.streams >= NEWS_CHANGES_MAX_STREAMS:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Muitas conexões abertas. Tente novamente.",
+            headers={"Retry-After": "30"},
+        )
+    return StreamingResponse(
+        broadcaster.events(since),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: nginx must pass each event through immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.get("/{news_id}", response_model=NewsResponse)
 @limiter.limit("100/minute")
 async def get_news_item(
     request: Request,
     news_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Obtém uma notícia específica (público)
     Rate limit: 100 requisições por minuto
     """
-    news_item = db.query(News).filter(News.id == news_id).first()
+    freshness = news_freshness(request)
+    not_modified = freshness.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    cache_key = ("item", freshness.version, news_id)
+    cached = news_cache.get(cache_key)
+    if cached is not None:
+        return await encoded_response(request, cached, freshness.headers)
+
+    news_item = await db.get(News, news_id)
     if not news_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notícia não encontrada"
         )
-    return news_item
+    cached = EncodedBody(dump_news_item(news_item))
+    news_cache.set(cache_key, cached)
+    return await encoded_response(request, cached, freshness.headers)
 
 @router.post("", response_model=NewsResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit("20/minute")
 async def create_news(
     request: Request,
     news_data: NewsCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: AdminUser = Depends(get_current_user)
 ):
     """
@@ -91,31 +380,259 @@ async def create_news(
     )
     
     db.add(db_news)
-    db.commit()
-    db.refresh(db_news)
+    await db.flush()
+    await adjust_archive(db, added=(db_news.date,))
+    version = await record_changes(db, (db_news.id,))
+    await db.commit()
+    _news_changed(changed_ids=(db_news.id,), version=version)
     
     return db_news
 
+def _news_changed(
+    changed_ids: Tuple[int, ...] = (),
+    deleted_ids: Tuple[int, ...] = (),
+    dates: Tuple[date_type, ...] = (),
+    rebuild: bool = False,
+    version: Optional[int] = None,
+):
+    """Post-commit side effects of a news write
+
+    `dates` are the previous dates of changed items; `version` is the change
+    feed version returned by record_changes. Only in-memory updates run here;
+    the rest goes to the background job queue, so the request doesn't wait.
+    """
+    bump_news_version()
+    broadcaster.publish(version)
+    schedule_publish(changed_ids, deleted_ids, dates, rebuild)
+    schedule_proxy_purge()
+
+async def _ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Linha muito longa no arquivo de importação"
+            )
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'linha'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+async def _import_batch(db: AsyncSession, batch: List[dict]) -> List[int]:
+    ids = (await db.scalars(insert(News).returning(News.id), batch)).all()
+    await adjust_archive(db, added=[item["date"] for item in batch])
+    return ids
+
+@router.post("/import", response_model=NewsImportResult)
+@limiter.limit("5/minute")
+async def import_news(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """
+    Importa notícias em lote a partir de um corpo NDJSON (requer autenticação)
+    Cada linha é validada como em POST /api/news; linhas inválidas são
+    relatadas e as válidas são inseridas em lotes numa única transação.
+    Rate limit: 5 requisições por minuto
+    """
+    today = date_type.today()
+    failed = 0
+    errors: List[NewsImportError] = []
+    batch: List[dict] = []
+    imported_ids: List[int] = []
+
+    def report(line_number: int, message: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+            errors.append(NewsImportError(line=line_number, error=message))
+
+    line_number = 0
+    async for line in _ndjson_lines(request.stream()):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            news_data = NewsCreate.model_validate_json(line)
+        except ValidationError as e:
+            report(line_number, _validation_message(e))
+            continue
+        if news_data.date > today:
+            report(line_number, "Data da notícia não pode ser no futuro")
+            continue
+
+        batch.append(news_data.model_dump())
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            imported_ids += await _import_batch(db, batch)
+            batch = []
+
+    if batch:
+        imported_ids += await _import_batch(db, batch)
+
+    imported = len(imported_ids)
+    if imported:
+        version = await record_changes(db, imported_ids)
+        await db.commit()
+        _news_changed(rebuild=True, version=version)
+
+    return NewsImportResult(imported=imported, failed=failed, errors=errors)
+
+def _check_batch_changes(changes: dict, today: date_type) -> Optional[str]:
+    """Error message for an update that NewsUpdate accepts but PUT /api/news/{id} rejects"""
+    if not changes:
+        return "Nenhum campo para atualizar"
+    for field, value in changes.items():
+        if value is None:
+            return EMPTY_FIELD_MESSAGES[field]
+    if "date" in changes and changes["date"] > today:
+        return "Data da notícia não pode ser no futuro"
+    return None
+
+@router.post("/batch", response_model=NewsBatchResult)
+@limiter.limit("10/minute")
+async def batch_news(
+    request: Request,
+    batch: NewsBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """
+    Edita e remove várias notícias em uma única transação (requer autenticação)
+    Cada operação é `{"op": "update", "id": 1, "changes": {...}}` (campos
+    como em PUT /api/news/{id}) ou `{"op": "delete", "id": 1}`. Operações
+    inválidas, repetidas ou de notícias inexistentes são relatadas em
+    `results` e as demais são aplicadas.
+    Rate limit: 10 requisições por minuto (cada lote conta uma vez)
+    """
+    today = date_type.today()
+    results: List[Optional[NewsBatchItemResult]] = [None] * len(batch.operations)
+    # Updates with the same changes share one UPDATE statement
+    updates: Dict[tuple, List[Tuple[int, int]]] = {}
+    deletes: List[Tuple[int, int]] = []
+    seen = set()
+
+    for index, raw in enumerate(batch.operations):
+        try:
+            operation = BATCH_OPERATION.validate_python(raw)
+        except ValidationError as e:
+            news_id = raw.get("id")
+            op = raw.get("op")
+            results[index] = NewsBatchItemResult(
+                index=index,
+                id=news_id if isinstance(news_id, int) else None,
+                op=op if isinstance(op, str) else None,
+                status="invalid",
+                error=_validation_message(e),
+            )
+            continue
+
+        error = None
+        if operation.id in seen:
+            error = "Notícia repetida no lote"
+        elif operation.op == "update":
+            changes = operation.changes.model_dump(exclude_unset=True)
+            error = _check_batch_changes(changes, today)
+        if error:
+            results[index] = NewsBatchItemResult(
+                index=index, id=operation.id, op=operation.op, status="invalid", error=error
+            )
+            continue
+
+        seen.add(operation.id)
+        if operation.op == "update":
+            updates.setdefault(tuple(sorted(changes.items())), []).append((index, operation.id))
+        else:
+            deletes.append((index, operation.id))
+
+    # Existing rows and their current dates (for the static month files),
+    # locked until the end of the transaction
+    previous_dates: Dict[int, date_type] = {}
+    if seen:
+        rows = await db.execute(
+            select(News.id, News.date).where(News.id.in_(seen)).with_for_update()
+        )
+        previous_dates = dict(rows.all())
+
+    changed_ids: List[int] = []
+    deleted_ids: List[int] = []
+    added_dates: List[date_type] = []
+    removed_dates: List[date_type] = []
+    groups = [("update", changes, group) for changes, group in updates.items()]
+    groups.append(("delete", None, deletes))
+    for op, changes, group in groups:
+        found = [news_id for _, news_id in group if news_id in previous_dates]
+        if found:
+            if op == "update":
+                values = dict(changes)
+                statement = update(News).where(News.id.in_(found)).values(values)
+                changed_ids += found
+                if "date" in values:
+                    added_dates += [values["date"]] * len(found)
+                    removed_dates += [previous_dates[news_id] for news_id in found]
+            else:
+                statement = delete(News).where(News.id.in_(found))
+                deleted_ids += found
+                removed_dates += [previous_dates[news_id] for news_id in found]
+            await db.execute(statement.execution_options(synchronize_session=False))
+        for index, news_id in group:
+            results[index] = NewsBatchItemResult(
+                index=index,
+                id=news_id,
+                op=op,
+                status=("updated" if op == "update" else "deleted") if news_id in previous_dates else "not_found",
+                error=None if news_id in previous_dates else "Notícia não encontrada",
+            )
+
+    if changed_ids or deleted_ids:
+        await adjust_archive(db, added=added_dates, removed=removed_dates)
+        version = await record_changes(db, changed_ids + deleted_ids)
+        await db.commit()
+        _news_changed(
+            changed_ids=tuple(changed_ids),
+            deleted_ids=tuple(deleted_ids),
+            dates=tuple(previous_dates.values()),
+            version=version,
+        )
+
+    return NewsBatchResult(
+        updated=len(changed_ids),
+        deleted=len(deleted_ids),
+        failed=sum(result.status in ("invalid", "not_found") for result in results),
+        results=results,
+    )
+
 @router.put("/{news_id}", response_model=NewsResponse)
 @limiter.limit("30/minute")
 async def update_news(
     request: Request,
     news_id: int,
     news_data: NewsUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: AdminUser = Depends(get_current_user)
 ):
     """
     Atualiza uma notícia existente (requer autenticação)
     Rate limit: 30 requisições por minuto
     """
-    db_news = db.query(News).filter(News.id == news_id).first()
+    db_news = await db.get(News, news_id)
     if not db_news:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notícia não encontrada"
         )
     
+    previous_date = db_news.date
+
     # Validação de dados atualizados
     update_data = news_data.model_dump(exclude_unset=True)
     
@@ -151,32 +668,80 @@ async def update_news(
             )
         db_news.date = update_data["date"]
     
-    db.commit()
-    db.refresh(db_news)
+    if db_news.date != previous_date:
+        await adjust_archive(db, added=(db_news.date,), removed=(previous_date,))
+    version = await record_changes(db, (news_id,))
+    await db.commit()
+    _news_changed(changed_ids=(news_id,), dates=(previous_date,), version=version)
     
     return db_news
 
+@router.post("/{news_id}/media", response_model=NewsResponse)
+@limiter.limit("10/minute")
+async def upload_news_media(
+    request: Request,
+    news_id: int,
+    alt: str = Query("", max_length=255, description="Texto alternativo da imagem"),
+    db: AsyncSession = Depends(get_db),
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """
+    Adiciona uma imagem a uma notícia (requer autenticação)
+    O corpo da requisição é o próprio arquivo (JPEG, PNG, WebP ou GIF).
+    São geradas variantes WebP e JPEG em várias larguras, com nomes pelo
+    hash do conteúdo; as URLs e dimensões aparecem em `media` na notícia.
+    Rate limit: 10 requisições por minuto
+    """
+    if await db.scalar(select(News.id).where(News.id == news_id)) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Notícia não encontrada"
+        )
+    # Don't hold a connection while the upload is received and processed
+    await db.rollback()
+
+    media = await create_media(request.stream(), alt.strip())
+
+    db_news = await db.get(News, news_id, with_for_update=True)
+    if not db_news:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Notícia não encontrada"
+        )
+    # The same file uploaded again is already attached
+    if all(item["id"] != media["id"] for item in db_news.media):
+        # JSON columns don't track in-place changes; assign a new list
+        db_news.media = [*db_news.media, media]
+        version = await record_changes(db, (news_id,))
+        await db.commit()
+        _news_changed(changed_ids=(news_id,), version=version)
+
+    return db_news
+
 @router.delete("/{news_id}", status_code=status.HTTP_204_NO_CONTENT)
 @limiter.limit("20/minute")
 async def delete_news(
     request: Request,
     news_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: AdminUser = Depends(get_current_user)
 ):
     """
     Remove uma notícia (requer autenticação)
     Rate limit: 20 requisições por minuto
     """
-    db_news = db.query(News).filter(News.id == news_id).first()
+    db_news = await db.get(News, news_id)
     if not db_news:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notícia não encontrada"
         )
     
-    db.delete(db_news)
-    db.commit()
+    await db.delete(db_news)
+    await adjust_archive(db, removed=(db_news.date,))
+    version = await record_changes(db, (news_id,))
+    await db.commit()
+    _news_changed(deleted_ids=(news_id,), dates=(db_news.date,), version=version)
     
     return None
 
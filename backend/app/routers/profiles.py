@@ -0,0 +1,46 @@
+"""
+Perfis de requisições gravados pelo ProfilingMiddleware (app/profiling.py)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse
+from typing import List
+import asyncio
+
+from app.database import AdminUser
+from app.models import ProfileInfo
+from app.auth import get_current_user
+from app.limiter import limiter
+from app.profiling import list_profiles, profile_path
+
+router = APIRouter()
+
+@router.get("", response_model=List[ProfileInfo])
+@limiter.limit("30/minute")
+async def get_profiles(
+    request: Request,
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """
+    Lista os perfis gravados neste servidor, do mais recente ao mais antigo (requer autenticação)
+    Rate limit: 30 requisições por minuto
+    """
+    return await asyncio.to_thread(list_profiles)
+
+@router.get("/{name}")
+@limiter.limit("30/minute")
+async def download_profile(
+    request: Request,
+    name: str,
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """
+    Baixa um perfil no formato collapsed stacks (flamegraph.pl, speedscope) (requer autenticação)
+    Rate limit: 30 requisições por minuto
+    """
+    path = await asyncio.to_thread(profile_path, name)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Perfil não encontrado"
+        )
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=name)
@@ -0,0 +1,111 @@
+"""
+Dados da primeira carga do site (notícias, contato e metadados) em uma única requisição
+"""
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+import os
+from dotenv import load_dotenv
+
+from app.database import get_db, get_read_db, News, Contact, AdminUser
+from app.models import ContactResponse, ContactUpdate, SiteResponse
+from app.auth import get_current_user
+from app.limiter import limiter
+from app.cache import news_cache
+from app.serializers import SUMMARY_FIELDS, dump_json, news_to_dict
+from app.compression import EncodedBody, encoded_response
+from app.routers.news import encode_cursor
+from app.changes import broadcaster, latest_version
+
+load_dotenv()
+
+router = APIRouter()
+
+SITE_NAME = os.getenv("SITE_NAME", "Projeto Semear Lages")
+SITE_DESCRIPTION = os.getenv(
+    "SITE_DESCRIPTION",
+    "Capacitação profissional e inclusão social em Lages, SC"
+)
+# Matches the default `limit` of GET /api/news; the rest is paged from there
+SITE_NEWS_LIMIT = int(os.getenv("SITE_NEWS_LIMIT", "100"))
+
+SUMMARY_COLUMNS = tuple(getattr(News, field) for field in SUMMARY_FIELDS) + (News.id,)
+
+def _contact_to_dict(contact: Contact) -> dict:
+    return {"email": contact.email, "phone": contact.phone}
+
+async def _build_snapshot(db: AsyncSession) -> bytes:
+    # Read before the news: a write in between shows up again in the change
+    # feed, instead of being missed
+    news_version = await latest_version(db)
+    contact = await db.scalar(select(Contact).order_by(Contact.id).limit(1))
+    rows = (await db.execute(
+        select(*SUMMARY_COLUMNS)
+        .order_by(News.date.desc(), News.id.desc())
+        .limit(SITE_NEWS_LIMIT)
+    )).all()
+
+    next_cursor = None
+    if SITE_NEWS_LIMIT > 0 and len(rows) == SITE_NEWS_LIMIT:
+        next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+    return dump_json({
+        "site": {"name": SITE_NAME, "description": SITE_DESCRIPTION},
+        "contact": _contact_to_dict(contact) if contact else None,
+        "news": [news_to_dict(row, SUMMARY_FIELDS) for row in rows],
+        "news_next_cursor": next_cursor,
+        "news_version": news_version,
+    })
+
+@router.get("", response_model=SiteResponse)
+@limiter.limit("100/minute")
+async def get_site(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Notícias (resumo, sem o conteúdo), contato e metadados do site (público)
+    A resposta é montada uma vez e reaproveitada até a próxima alteração em
+    notícias ou no contato. Notícias além das primeiras seguem em
+    GET /api/news?cursor={news_next_cursor}; o conteúdo completo fica em
+    GET /api/news/{id}. A partir de `news_version`, as alterações seguintes
+    vêm de GET /api/news/changes e GET /api/news/changes/stream.
+    Rate limit: 100 requisições por minuto
+    """
+    # Shared versions: writes made through other workers show up here within
+    # NEWS_CHANGES_POLL_SECONDS
+    cache_key = ("site", broadcaster.version, broadcaster.contact_version)
+    cached = news_cache.get(cache_key)
+    if cached is None:
+        cached = EncodedBody(await _build_snapshot(db))
+        news_cache.set(cache_key, cached)
+    return await encoded_response(request, cached)
+
+@router.put("/contact", response_model=ContactResponse)
+@limiter.limit("20/minute")
+async def update_contact(
+    request: Request,
+    contact_data: ContactUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """
+    Atualiza o e-mail e o telefone de contato do site (requer autenticação)
+    Rate limit: 20 requisições por minuto
+    """
+    contact = await db.scalar(select(Contact).order_by(Contact.id).limit(1))
+    if contact is None:
+        contact = Contact(email=contact_data.email, phone=contact_data.phone, version=1)
+        db.add(contact)
+        await db.flush()
+    else:
+        # Incremented in the database, so concurrent updates never reuse a version
+        await db.execute(
+            update(Contact)
+            .where(Contact.id == contact.id)
+            .values(email=contact_data.email, phone=contact_data.phone, version=Contact.version + 1)
+        )
+    version = await db.scalar(select(Contact.version).where(Contact.id == contact.id))
+    await db.commit()
+    broadcaster.publish_contact(version)
+
+    return {"email": contact_data.email, "phone": contact_data.phone}
@@ -0,0 +1,103 @@
+"""
+Busca textual nas notícias
+
+PostgreSQL: coluna gerada `search_vector` (tsvector, configuração 'portuguese')
+com índice GIN; o próprio banco a mantém sincronizada em INSERT/UPDATE.
+SQLite (execução local e testes): tabela virtual FTS5 `news_fts` mantida por triggers.
+"""
+from typing import List
+from sqlalchemy import column, func, literal_column, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import News
+
+SEARCH_CONFIG = "portuguese"
+
+news_fts = table("news_fts", column("rowid"))
+
+POSTGRES_SETUP = [
+    f"""
+    ALTER TABLE news ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(excerpt, '')), 'B') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_news_search_vector ON news USING GIN (search_vector)",
+]
+
+SQLITE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE news_fts USING fts5(
+        title, excerpt, content,
+        content='news', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER news_fts_insert AFTER INSERT ON news BEGIN
+        INSERT INTO news_fts(rowid, title, excerpt, content)
+        VALUES (new.id, new.title, new.excerpt, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER news_fts_delete AFTER DELETE ON news BEGIN
+        INSERT INTO news_fts(news_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.id, old.title, old.excerpt, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER news_fts_update AFTER UPDATE ON news BEGIN
+        INSERT INTO news_fts(news_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.id, old.title, old.excerpt, old.content);
+        INSERT INTO news_fts(rowid, title, excerpt, content)
+        VALUES (new.id, new.title, new.excerpt, new.content);
+    END
+    """,
+    # Index rows that existed before the FTS table was created
+    "INSERT INTO news_fts(news_fts) VALUES ('rebuild')",
+]
+
+def setup_search(conn: Connection) -> None:
+    """Create the full-text search column/index (idempotent, run inside run_sync)"""
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRES_SETUP:
+            conn.execute(text(statement))
+    elif dialect == "sqlite":
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_fts'")
+        ).first()
+        if not exists:
+            for statement in SQLITE_SETUP:
+                conn.execute(text(statement))
+
+def _fts5_query(q: str) -> str:
+    # Quote every term so user input can't inject FTS5 operators
+    terms = [term.replace('"', '""') for term in q.split()]
+    return " ".join(f'"{term}"' for term in terms)
+
+async def search_news(db: AsyncSession, q: str, skip: int, limit: int) -> List[News]:
+    """Return news matching q, best ranked first"""
+    if db.bind.dialect.name == "postgresql":
+        vector = literal_column("news.search_vector")
+        query_ts = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), q)
+        query = (
+            select(News)
+            .where(vector.op("@@")(query_ts))
+            .order_by(func.ts_rank_cd(vector, query_ts).desc(), News.date.desc(), News.id.desc())
+        )
+    else:
+        terms = _fts5_query(q)
+        if not terms:
+            return []
+        # bm25 is lower-is-better; weights favour title over excerpt over content
+        query = (
+            select(News)
+            .join(news_fts, news_fts.c.rowid == News.id)
+            .where(literal_column("news_fts").op("MATCH")(terms))
+            .order_by(func.bm25(literal_column("news_fts"), 10.0, 5.0, 1.0), News.date.desc())
+        )
+    return list((await db.scalars(query.offset(skip).limit(limit))).all())
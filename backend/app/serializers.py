@@ -0,0 +1,31 @@
+"""
+Serialização rápida (orjson) das respostas públicas de notícias
+"""
+from typing import Any, Iterable, Sequence
+from fastapi import Response
+import orjson
+
+from app.database import News
+
+# Optional NewsResponse fields, in response order ("id" is always sent last)
+NEWS_FIELDS = ("title", "excerpt", "content", "date", "media")
+SUMMARY_FIELDS = ("title", "excerpt", "date", "media")
+
+def news_to_dict(news: News, fields: Sequence[str] = NEWS_FIELDS) -> dict:
+    """Build the NewsResponse representation of a row without Pydantic validation"""
+    data = {field: getattr(news, field) for field in fields}
+    data["id"] = news.id
+    return data
+
+def dump_json(data: Any) -> bytes:
+    return orjson.dumps(data)
+
+def dump_news_list(rows: Iterable[News], fields: Sequence[str] = NEWS_FIELDS) -> bytes:
+    return dump_json([news_to_dict(row, fields) for row in rows])
+
+def dump_news_item(row: News) -> bytes:
+    return dump_json(news_to_dict(row))
+
+def json_bytes_response(body: bytes, headers: dict | None = None) -> Response:
+    """Return already-encoded JSON, bypassing response_model validation"""
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,52 @@
+"""
+Compara dois resultados de benchmarks.load
+
+Mostra a variação de req/s e p95 por cenário e termina com código 1 se algum
+cenário piorou além do limite (padrão 10%), para uso em CI.
+
+Uso (no diretório backend):
+    python -m benchmarks.compare benchmarks/results/antes.json benchmarks/results/depois.json
+"""
+from pathlib import Path
+import argparse
+import json
+import sys
+
+def load(path: str) -> dict:
+    data = json.loads(Path(path).read_text())
+    return {result["name"]: result for result in data["results"]}
+
+def change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="piora tolerada (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    regressions = []
+    print(f"{'cenário':<14} {'req/s antes':>12} {'depois':>10} {'Δ':>8} {'p95 antes':>11} {'depois':>10} {'Δ':>8}")
+    for name, before in baseline.items():
+        after = candidate.get(name)
+        if after is None:
+            continue
+        rps_change = change(before["rps"], after["rps"])
+        p95_change = change(before["p95_ms"], after["p95_ms"])
+        flag = ""
+        if rps_change < -args.threshold or p95_change > args.threshold:
+            regressions.append(name)
+            flag = "  <- regressão"
+        print(
+            f"{name:<14} {before['rps']:>12.1f} {after['rps']:>10.1f} {rps_change:>+8.1%} "
+            f"{before['p95_ms']:>11.2f} {after['p95_ms']:>10.2f} {p95_change:>+8.1%}{flag}"
+        )
+
+    if regressions:
+        print(f"\nRegressões acima de {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark do custo por verificação de rate limit
+
+Mede o tempo de uma verificação (hit da estratégia sliding-window-counter)
+em cada armazenamento e o custo de resolver o IP do cliente atrás de proxy.
+
+Uso (no diretório backend):
+    python -m benchmarks.rate_limit
+"""
+import os
+import tempfile
+import time
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+from starlette.requests import Request
+
+from app import limiter as limiter_module
+
+ITERATIONS = 20000
+
+def per_call_microseconds(func, iterations: int = ITERATIONS) -> float:
+    for _ in range(100):  # warm up
+        func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def bench_storage(uri: str) -> float:
+    strategy = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    # Large limit so every hit goes through the full acquire path
+    item = parse(f"{ITERATIONS * 10}/minute")
+    counter = iter(range(10**9))
+    return per_call_microseconds(lambda: strategy.hit(item, f"client-{next(counter) % 100}"))
+
+def bench_key_func() -> float:
+    from ipaddress import ip_network
+
+    limiter_module.TRUSTED_PROXIES = [ip_network("172.16.0.0/12")]
+    limiter_module._is_trusted_proxy.cache_clear()
+    request = Request({
+        "type": "http",
+        "client": ("172.18.0.5", 40000),
+        "headers": [(b"x-forwarded-for", b"203.0.113.7, 172.18.0.5")],
+    })
+    return per_call_microseconds(lambda: limiter_module.get_client_ip(request))
+
+def main():
+    shm = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    with tempfile.TemporaryDirectory(dir=shm) as directory:
+        storages = {
+            "memory://": "memory://",
+            "sqlite (arquivo compartilhado)": f"sqlite:///{directory}/ratelimit.db",
+        }
+        for name, uri in storages.items():
+            print(f"{name:<32} {bench_storage(uri):8.2f} µs/verificação")
+    print(f"{'get_client_ip (proxy confiável)':<32} {bench_key_func():8.2f} µs/chamada")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Gerador de dados sintéticos para benchmarks
+
+Inicializa o banco como no deploy (app.bootstrap) e completa a tabela de
+notícias até o total pedido, com conteúdo determinístico (mesma semente,
+mesmos dados) para que execuções em commits diferentes sejam comparáveis.
+
+Uso (no diretório backend):
+    python -m benchmarks.seed --rows 100000 --database-url sqlite:///./bench.db
+"""
+from datetime import date, timedelta
+import argparse
+import asyncio
+import os
+import random
+
+WORDS = (
+    "projeto semear lages curso formatura turma culinária informática costura "
+    "parceria empresa emprego comunidade doação laboratório capacitação jovens "
+    "profissional oficina voluntários evento inauguração aula certificado"
+).split()
+
+SEED = 42
+BATCH_SIZE = 5000
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+def synthetic_news(rng: random.Random, count: int) -> list:
+    start = date.today()
+    return [
+        {
+            "title": _sentence(rng, rng.randint(4, 10))[:255],
+            "excerpt": _sentence(rng, rng.randint(12, 25)),
+            "content": " ".join(_sentence(rng, rng.randint(10, 30)) for _ in range(rng.randint(5, 20))),
+            "date": start - timedelta(days=rng.randint(0, 3650)),
+        }
+        for _ in range(count)
+    ]
+
+async def seed_news(rows: int, batch_size: int = BATCH_SIZE) -> int:
+    """Make sure the news table has at least `rows` rows; returns the final count"""
+    from sqlalchemy import func, insert, select
+    from app.bootstrap import bootstrap
+    from app.archive import adjust_archive
+    from app.changes import record_changes
+    from app.database import SessionLocal, News
+
+    await bootstrap()
+
+    async with SessionLocal() as db:
+        existing = await db.scalar(select(func.count()).select_from(News))
+        rng = random.Random(SEED + existing)
+        missing = rows - existing
+        while missing > 0:
+            batch = synthetic_news(rng, min(batch_size, missing))
+            ids = await db.scalars(insert(News).returning(News.id), batch)
+            await record_changes(db, ids.all())
+            await adjust_archive(db, added=[item["date"] for item in batch])
+            missing -= len(batch)
+        await db.commit()
+        return await db.scalar(select(func.count()).select_from(News))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--database-url", help="sobrescreve DATABASE_URL")
+    args = parser.parse_args()
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    total = asyncio.run(seed_news(args.rows))
+    print(f"Tabela news com {total} notícias")
+
+if __name__ == "__main__":
+    main()
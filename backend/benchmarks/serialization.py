@@ -0,0 +1,80 @@
+"""
+Benchmark da serialização da lista de notícias
+
+Compara o caminho padrão do FastAPI (validação via response_model=List[NewsResponse]
++ jsonable_encoder + json.dumps a cada requisição) com o caminho rápido
+(bytes gerados uma vez por versão com orjson e reaproveitados do cache).
+
+Uso (no diretório backend):
+    python -m benchmarks.serialization
+"""
+from datetime import date, timedelta
+from typing import List
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.database import News
+from app.models import NewsResponse
+from app.serializers import dump_news_list
+from app.cache import TTLCache
+
+SIZES = (100, 1000)
+
+def make_rows(count: int) -> List[News]:
+    start = date(2024, 10, 15)
+    return [
+        News(
+            id=i,
+            title=f"Notícia {i}",
+            excerpt="Resumo da notícia com alguns detalhes. " * 2,
+            content="Conteúdo completo da notícia, com vários parágrafos de texto. " * 20,
+            date=start - timedelta(days=i),
+        )
+        for i in range(1, count + 1)
+    ]
+
+def per_call_seconds(func, min_time: float = 1.0) -> float:
+    """Average CPU time of func, repeating until min_time has elapsed"""
+    func()  # warm up
+    calls = 0
+    start = time.process_time()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.process_time() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+def main():
+    adapter = TypeAdapter(List[NewsResponse])
+
+    print(f"{'itens':>6} {'padrão (ms)':>12} {'orjson (ms)':>12} {'cache hit (µs)':>15} {'economia/req':>13}")
+    for size in SIZES:
+        rows = make_rows(size)
+
+        def default_path():
+            validated = adapter.validate_python(rows, from_attributes=True)
+            json.dumps(jsonable_encoder(validated)).encode()
+
+        def fast_build():
+            dump_news_list(rows)
+
+        cache = TTLCache(16, 60)
+        cache.set(("list", 0), dump_news_list(rows))
+
+        def fast_hit():
+            cache.get(("list", 0))
+
+        default_cost = per_call_seconds(default_path)
+        build_cost = per_call_seconds(fast_build)
+        hit_cost = per_call_seconds(fast_hit, min_time=0.2)
+        print(
+            f"{size:>6} {default_cost * 1e3:>12.3f} {build_cost * 1e3:>12.3f} "
+            f"{hit_cost * 1e6:>15.2f} {(default_cost - hit_cost) * 1e3:>10.3f} ms"
+        )
+
+if __name__ == "__main__":
+    main()
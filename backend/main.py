@@ -1,28 +1,69 @@
+import time
+
+# Measured from here to report how long the worker spends importing the app
+_IMPORT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 import os
 from dotenv import load_dotenv
 
-from app.routers import auth, news
-from app.database import init_db
-from app.limiter import limiter
+from app.routers import auth, news, profiles, site
+from app.database import engine, read_engine, ReadYourWritesMiddleware
+from app.limiter import limiter, rate_limit_exceeded_handler
+from app import metrics
+from app.auth import prepare_dummy_hash, shutdown_hash_executor
+from app.migrations import check_schema
+from app.media import MEDIA_DIR, shutdown_media_executor
+from app.changes import broadcaster
+from app.jobs import jobs
+from app.revocation import revocations
+from app.profiling import ProfilingMiddleware
 
 load_dotenv()
 
+startup_times = {"import": 0.0, "startup": 0.0}
+metrics.register_gauge(
+    "semear_startup_import_seconds",
+    "Tempo de importação da aplicação neste worker.",
+    lambda: startup_times["import"],
+)
+metrics.register_gauge(
+    "semear_startup_seconds",
+    "Duração do lifespan de inicialização neste worker.",
+    lambda: startup_times["startup"],
+)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    init_db()
-    # Initialize initial data
-    from app.init_data import init_data
-    init_data()
+    # Startup: migrations, seed data and static files are handled once per
+    # deploy by `python -m app.bootstrap`; workers only check the schema version
+    started = time.perf_counter()
+    await check_schema()
+    await prepare_dummy_hash()
+    await broadcaster.start()
+    await revocations.start()
+    jobs.start()
+    startup_times["startup"] = time.perf_counter() - started
+    print(
+        f"Worker {os.getpid()} pronto: importação {startup_times['import']:.3f}s, "
+        f"inicialização {startup_times['startup']:.3f}s"
+    )
     yield
     # Shutdown
-    pass
+    await broadcaster.stop()
+    await revocations.stop()
+    # Queued work (static publishing) still needs the database
+    await jobs.stop()
+    shutdown_hash_executor()
+    shutdown_media_executor()
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
 
 app = FastAPI(
     title="Projeto Semear Lages API",
@@ -33,7 +74,7 @@ app = FastAPI(
 
 # Configurar rate limiter
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler) # type: ignore
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler) # type: ignore
 
 # CORS configuration
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
@@ -58,11 +99,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Clients that just wrote keep reading from the primary (see get_read_db)
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Opt-in request profiling (PROFILING_ENABLED); a no-op otherwise
+app.add_middleware(ProfilingMiddleware)
+
+# Added last so it wraps everything else, CORS included
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(news.router, prefix="/api/news", tags=["News"])
+app.include_router(site.router, prefix="/api/site", tags=["Site"])
+app.include_router(profiles.router, prefix="/api/profiles", tags=["Profiles"])
+
+# Uploaded news images; in production nginx serves /media/ before reaching the backend
+MEDIA_DIR.mkdir(parents=True, exist_ok=True)
+app.mount("/media", StaticFiles(directory=MEDIA_DIR), name="media")
 
 @app.get("/")
 @limiter.limit("100/minute")
@@ -73,3 +130,12 @@ async def root(request: Request):
 @limiter.limit("200/minute")
 async def health_check(request: Request):
     return {"status": "healthy"}
+
+@app.get("/api/metrics", include_in_schema=False)
+@limiter.limit("120/minute")
+async def get_metrics(request: Request):
+    """Métricas no formato do Prometheus"""
+    metrics.check_metrics_token(request)
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+startup_times["import"] = time.perf_counter() - _IMPORT_STARTED
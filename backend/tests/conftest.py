@@ -0,0 +1,62 @@
+"""
+Configuração dos testes: API no mesmo processo sobre um SQLite temporário
+"""
+from pathlib import Path
+import os
+import sys
+import tempfile
+
+# Must be set before the app is imported: engine, limiter and bcrypt cost are read at import time
+_db_dir = tempfile.mkdtemp(prefix="semear-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["MEDIA_DIR"] = f"{_db_dir}/media"
+os.environ.pop("STATIC_NEWS_DIR", None)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+
+from app.bootstrap import bootstrap
+from app.database import engine
+from main import app
+
+ADMIN_CREDENTIALS = {
+    "email": os.getenv("ADMIN_EMAIL", "admin@projetosemear.org.br"),
+    "password": os.getenv("ADMIN_PASSWORD", "admin123"),
+}
+
+async def _prepare_database():
+    await bootstrap()
+    # The app runs on TestClient's own event loop; don't hand it these connections
+    await engine.dispose()
+
+@pytest.fixture(scope="session")
+def client():
+    asyncio.run(_prepare_database())
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture(scope="session")
+def admin(client):
+    """The same client, authenticated as the default admin (token cookie)"""
+    response = client.post("/api/auth/login", json=ADMIN_CREDENTIALS)
+    assert response.status_code == 200
+    return client
+
+@pytest.fixture
+def create_news(admin):
+    def create(**fields):
+        payload = {
+            "title": "Notícia de teste",
+            "excerpt": "Resumo de teste",
+            "content": "Conteúdo de teste",
+            "date": "2024-01-01",
+            **fields,
+        }
+        response = admin.post("/api/news", json=payload)
+        assert response.status_code == 201, response.text
+        return response.json()
+    return create
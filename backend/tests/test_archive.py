@@ -0,0 +1,67 @@
+"""
+Arquivo por mês (GET /api/news/archive) e filtro por período em GET /api/news
+"""
+from collections import Counter
+
+from sqlalchemy import create_engine, update
+
+from app import database
+from app.archive import rebuild_archive
+from app.cache import bump_news_version
+from app.database import NewsArchive
+
+def _archive(client):
+    response = client.get("/api/news/archive")
+    assert response.status_code == 200
+    return {(item["year"], item["month"]): item["count"] for item in response.json()}
+
+def _recount(client):
+    listed = client.get("/api/news", params={"limit": 10000, "fields": "date"}).json()
+    return dict(Counter((int(item["date"][:4]), int(item["date"][5:7])) for item in listed))
+
+def test_archive_follows_every_kind_of_write(admin, create_news):
+    created = create_news(date="2021-02-10")
+    moved = create_news(date="2021-02-20")
+    removed = create_news(date="2021-03-05")
+    assert _archive(admin) == _recount(admin)
+
+    admin.put(f"/api/news/{moved['id']}", json={"date": "2021-04-01"})
+    admin.delete(f"/api/news/{removed['id']}")
+    admin.post("/api/news/batch", json={"operations": [
+        {"op": "update", "id": created["id"], "changes": {"date": "2021-05-15"}},
+    ]})
+    admin.post("/api/news/import", content=b'{"title": "x", "excerpt": "x", "content": "x", "date": "2021-05-30"}\n')
+
+    archive = _archive(admin)
+    assert archive == _recount(admin)
+    assert (2021, 3) not in archive and archive[(2021, 5)] >= 2
+    months = list(archive)
+    assert months == sorted(months, reverse=True)
+
+def test_rebuild_fixes_drift(admin, create_news):
+    create_news(date="2020-07-07")
+    sync_engine = create_engine(f"sqlite:///{database.engine.url.database}")
+    try:
+        with sync_engine.begin() as conn:
+            conn.execute(update(NewsArchive).values(count=NewsArchive.count + 5))
+        bump_news_version()
+        assert _archive(admin) != _recount(admin)
+
+        with sync_engine.begin() as conn:
+            rebuild_archive(conn)
+        bump_news_version()
+        assert _archive(admin) == _recount(admin)
+    finally:
+        sync_engine.dispose()
+
+def test_list_filters_by_date_range(client, create_news):
+    inside = create_news(title="Dentro do período", date="2019-08-31")
+    create_news(title="Fora do período", date="2019-09-01")
+
+    response = client.get("/api/news", params={"from": "2019-08-01", "to": "2019-08-31", "fields": "date"})
+    assert response.status_code == 200
+    items = response.json()
+    assert inside["id"] in [item["id"] for item in items]
+    assert all("2019-08-01" <= item["date"] <= "2019-08-31" for item in items)
+
+    assert client.get("/api/news", params={"from": "2019-09-01", "to": "2019-08-01"}).status_code == 400
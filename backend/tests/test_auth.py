@@ -0,0 +1,93 @@
+"""
+Autenticação: cache do administrador autenticado e pool de hashing de senhas
+"""
+from datetime import timedelta
+import asyncio
+import threading
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app import auth, database, metrics
+from app.auth import create_access_token, principal_cache
+from app.database import AdminUser
+from tests.conftest import ADMIN_CREDENTIALS
+
+def _statement_free_requests(route):
+    histogram = metrics._request_statements.get(("GET", route))
+    return histogram.counts[0] if histogram else 0
+
+def test_principal_is_cached_between_requests(admin):
+    principal_cache.clear()
+    assert admin.get("/api/auth/me").status_code == 200
+    assert principal_cache.get(ADMIN_CREDENTIALS["email"]) is not None
+
+    before = _statement_free_requests("/api/auth/me")
+    assert admin.get("/api/auth/me").status_code == 200
+    assert _statement_free_requests("/api/auth/me") == before + 1
+
+def test_cached_principal_survives_a_rollback_in_its_request(admin, create_news):
+    news = create_news()
+    principal_cache.clear()
+    # The upload rolls back its session after authenticating, then fails on the image
+    response = admin.post(f"/api/news/{news['id']}/media", content=b"not an image")
+    assert response.status_code == 400
+    assert admin.get("/api/auth/me").json()["email"] == ADMIN_CREDENTIALS["email"]
+
+def test_orm_updates_drop_the_cached_principal(admin):
+    assert admin.get("/api/auth/me").status_code == 200
+    email = ADMIN_CREDENTIALS["email"]
+    assert principal_cache.get(email) is not None
+
+    sync_engine = create_engine(f"sqlite:///{database.engine.url.database}")
+    try:
+        with Session(sync_engine) as session:
+            user = session.scalar(select(AdminUser).where(AdminUser.email == email))
+            original = user.hashed_password
+            user.hashed_password = "x"
+            session.commit()
+            assert principal_cache.get(email) is None
+            user.hashed_password = original
+            session.commit()
+    finally:
+        sync_engine.dispose()
+
+def test_cached_principal_never_outlives_the_token(client):
+    principal_cache.clear()
+    token = create_access_token({"sub": ADMIN_CREDENTIALS["email"]}, expires_delta=timedelta(seconds=2))
+    anonymous = type(client)(client.app)
+    assert anonymous.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+    expires_at, _ = principal_cache._entries[ADMIN_CREDENTIALS["email"]]
+    assert expires_at - time.monotonic() <= 2
+
+def test_password_hashing_runs_in_the_pool():
+    thread_name = asyncio.run(auth._run_hash_job(lambda: threading.current_thread().name))
+    assert thread_name.startswith("password-hash")
+
+def test_full_hashing_queue_answers_503(client, monkeypatch):
+    monkeypatch.setattr(auth, "PASSWORD_HASH_QUEUE_LIMIT", 0)
+    anonymous = type(client)(client.app)
+    response = anonymous.post("/api/auth/login", json=ADMIN_CREDENTIALS)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+def test_unknown_email_is_checked_against_the_startup_dummy_hash(client, monkeypatch):
+    # Hashed by the lifespan, so the first unknown-email login doesn't pay for it
+    assert auth._dummy_hash is not None
+    verified = []
+    original = auth.pwd_context.verify
+
+    def verify(password, hashed):
+        verified.append(hashed)
+        return original(password, hashed)
+
+    monkeypatch.setattr(auth.pwd_context, "verify", verify)
+
+    anonymous = type(client)(client.app)
+    unknown = anonymous.post("/api/auth/login", json={"email": "ninguem@example.com", "password": "x"})
+    wrong = anonymous.post("/api/auth/login", json={**ADMIN_CREDENTIALS, "password": "senha errada"})
+    assert unknown.status_code == wrong.status_code == 401
+    assert unknown.json() == wrong.json()
+    assert verified == [auth._dummy_hash]
@@ -0,0 +1,49 @@
+"""
+Edição e remoção de notícias em lote (POST /api/news/batch)
+"""
+
+def test_batch_applies_valid_operations_and_reports_each_one(admin, create_news):
+    first = create_news(title="Lote 1", date="2023-05-01")
+    second = create_news(title="Lote 2", date="2023-05-02")
+    third = create_news(title="Lote 3")
+    removed = create_news(title="Lote removida")
+
+    response = admin.post("/api/news/batch", json={"operations": [
+        {"op": "update", "id": first["id"], "changes": {"date": "2022-01-10"}},
+        {"op": "update", "id": second["id"], "changes": {"date": "2022-01-10"}},
+        {"op": "update", "id": third["id"], "changes": {"title": "  Novo título  "}},
+        {"op": "delete", "id": removed["id"]},
+        {"op": "delete", "id": 999999},
+        {"op": "update", "id": third["id"], "changes": {"title": "Repetida"}},
+        {"op": "update", "id": first["id"], "changes": {"date": "2999-01-01"}},
+        {"op": "update", "id": second["id"], "changes": {"title": ""}},
+        {"op": "rename", "id": first["id"]},
+    ]})
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["updated"], result["deleted"], result["failed"]) == (3, 1, 5)
+    assert [item["status"] for item in result["results"]] == [
+        "updated", "updated", "updated", "deleted", "not_found",
+        "invalid", "invalid", "invalid", "invalid",
+    ]
+    assert [item["index"] for item in result["results"]] == list(range(9))
+
+    assert admin.get(f"/api/news/{first['id']}").json()["date"] == "2022-01-10"
+    assert admin.get(f"/api/news/{second['id']}").json()["title"] == "Lote 2"
+    assert admin.get(f"/api/news/{third['id']}").json()["title"] == "Novo título"
+    assert admin.get(f"/api/news/{removed['id']}").status_code == 404
+
+def test_batch_writes_reach_the_change_feed(admin, create_news):
+    news = create_news(title="Antes do lote")
+    since = admin.get("/api/news/changes", params={"since": 10**9}).json()["version"]
+
+    admin.post("/api/news/batch", json={"operations": [
+        {"op": "update", "id": news["id"], "changes": {"excerpt": "Resumo em lote"}},
+    ]})
+    feed = admin.get("/api/news/changes", params={"since": since}).json()
+    assert [item["excerpt"] for item in feed["changes"]] == ["Resumo em lote"]
+
+def test_batch_requires_authentication_and_operations(client):
+    anonymous = type(client)(client.app)
+    assert anonymous.post("/api/news/batch", json={"operations": [{"op": "delete", "id": 1}]}).status_code == 401
+    assert client.post("/api/news/batch", json={"operations": []}).status_code == 422
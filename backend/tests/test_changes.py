@@ -0,0 +1,57 @@
+"""
+Feed de alterações das notícias (GET /api/news/changes e o stream SSE)
+"""
+from app import changes
+
+def _version(client):
+    return client.get("/api/news/changes", params={"since": 10**9}).json()["version"]
+
+def test_changes_return_latest_state_and_tombstones(admin, create_news):
+    since = _version(admin)
+    kept = create_news(title="Versão 1")
+    admin.put(f"/api/news/{kept['id']}", json={"title": "Versão 2"})
+    removed = create_news(title="Removida")
+    admin.delete(f"/api/news/{removed['id']}")
+
+    response = admin.get("/api/news/changes", params={"since": since})
+    assert response.status_code == 200
+    feed = response.json()
+    assert [item["title"] for item in feed["changes"]] == ["Versão 2"]
+    assert feed["changes"][0]["content"] == kept["content"]
+    assert feed["deleted"] == [removed["id"]]
+    assert feed["has_more"] is False
+    assert feed["version"] == _version(admin) > since
+
+    # Nothing new after the returned version
+    empty = admin.get("/api/news/changes", params={"since": feed["version"]}).json()
+    assert empty == {"version": feed["version"], "changes": [], "deleted": [], "has_more": False}
+
+def test_changes_are_paged_by_version(admin, create_news):
+    since = _version(admin)
+    created = [create_news(title=f"Feed {n}")["id"] for n in range(3)]
+
+    seen = []
+    while True:
+        feed = admin.get("/api/news/changes", params={"since": since, "limit": 2}).json()
+        seen += [item["id"] for item in feed["changes"]]
+        since = feed["version"]
+        if not feed["has_more"]:
+            break
+    assert seen == created
+
+def test_full_sync_includes_every_news_item(client):
+    feed = client.get("/api/news/changes", params={"since": 0, "limit": 1000}).json()
+    listed = client.get("/api/news", params={"limit": 1000, "fields": "title"}).json()
+    assert {item["id"] for item in feed["changes"]} == {item["id"] for item in listed}
+
+def test_stream_pushes_versions_after_last_event_id(admin, create_news, monkeypatch):
+    create_news(title="Para o stream")
+    version = _version(admin)
+    # Short-lived stream, so the whole response can be read
+    monkeypatch.setattr(changes, "NEWS_CHANGES_STREAM_SECONDS", 0.2)
+
+    response = admin.get("/api/news/changes/stream", headers={"Last-Event-ID": str(version - 1)})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert f"id: {version}\nevent: version\ndata: {{\"version\":{version}}}\n\n" in response.text
+    assert changes.broadcaster.streams == 0
@@ -0,0 +1,45 @@
+"""
+Negociação de Accept-Encoding e compressão das leituras de notícias
+"""
+import gzip
+import json
+
+import brotli
+
+from app.compression import negotiate_encoding
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert negotiate_encoding("br;q=0, gzip") == "gzip"
+    assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("") is None
+
+def _raw_get(client, url, accept_encoding):
+    # Read the bytes as sent, without httpx decoding them
+    with client.stream("GET", url, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+def test_list_is_compressed_per_accept_encoding(client, create_news):
+    for day in range(1, 4):
+        create_news(title=f"Compressão {day}", content="Texto longo de notícia. " * 100)
+    expected = client.get("/api/news").json()
+
+    response, body = _raw_get(client, "/api/news", "br")
+    assert response.headers["content-encoding"] == "br"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert json.loads(brotli.decompress(body)) == expected
+
+    response, body = _raw_get(client, "/api/news", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body)) == expected
+
+    response, body = _raw_get(client, "/api/news", "identity")
+    assert "content-encoding" not in response.headers
+    assert json.loads(body) == expected
+
+def test_small_bodies_are_not_compressed(client):
+    response, body = _raw_get(client, "/api/news/search?q=nenhumresultado", "gzip, br")
+    assert "content-encoding" not in response.headers
+    assert body == b"[]"
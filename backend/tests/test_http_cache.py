@@ -0,0 +1,106 @@
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import timedelta
+import sqlite3
+import time
+
+from app import database, http_cache, metrics
+from app.changes import broadcaster
+from app.routers import news as news_router
+
+def _statement_free_requests(route):
+    histogram = metrics._request_statements.get(("GET", route))
+    return histogram.counts[0] if histogram else 0
+
+def test_list_revalidates_without_loading_rows(client, create_news, monkeypatch):
+    create_news(title="Com ETag")
+    response = client.get("/api/news")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "public, no-cache"
+    assert "last-modified" in response.headers
+
+    async def no_rows(*args, **kwargs):
+        raise AssertionError("rows loaded for a conditional request")
+
+    monkeypatch.setattr(news_router, "_load_news_page", no_rows)
+    revalidated = client.get("/api/news", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+def test_cache_hits_and_revalidation_skip_the_database(client, create_news):
+    create_news(title="Sem consulta")
+    etag = client.get("/api/news").headers["etag"]
+
+    before = _statement_free_requests("/api/news")
+    assert client.get("/api/news").status_code == 200
+    assert client.get("/api/news", headers={"If-None-Match": etag}).status_code == 304
+    assert _statement_free_requests("/api/news") == before + 2
+
+def test_other_workers_writes_are_picked_up(client, create_news):
+    create_news()
+    etag = client.get("/api/news/archive").headers["etag"]
+
+    # Another worker's write only shows up in the database
+    with sqlite3.connect(database.engine.url.database) as conn:
+        conn.execute(
+            "INSERT INTO news_changes (news_id, changed_at) VALUES (0, CURRENT_TIMESTAMP)"
+        )
+    version = broadcaster.version
+    for _ in range(60):
+        if broadcaster.version > version:
+            break
+        time.sleep(0.1)
+    assert broadcaster.version > version
+    assert client.get("/api/news/archive", headers={"If-None-Match": etag}).status_code == 200
+
+def test_write_changes_etag(client, create_news):
+    item = create_news(title="Primeira versão")
+    first = client.get(f"/api/news/{item['id']}")
+    etag = first.headers["etag"]
+    assert client.get(f"/api/news/{item['id']}", headers={"If-None-Match": etag}).status_code == 304
+
+    create_news(title="Outra")
+    second = client.get(f"/api/news/{item['id']}", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert client.get("/api/news/archive", headers={"If-None-Match": etag}).status_code == 200
+
+def test_wildcard_does_not_hide_missing_items(client):
+    assert client.get("/api/news/987654", headers={"If-None-Match": "*"}).status_code == 404
+
+def test_if_modified_since(client, create_news):
+    create_news()
+    last_modified = client.get("/api/news/archive").headers["last-modified"]
+    assert client.get("/api/news/archive", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    earlier = format_datetime(parsedate_to_datetime(last_modified) - timedelta(seconds=1), usegmt=True)
+    assert client.get("/api/news/archive", headers={"If-Modified-Since": earlier}).status_code == 200
+    # If-None-Match takes precedence
+    stale = client.get(
+        "/api/news/archive",
+        headers={"If-Modified-Since": last_modified, "If-None-Match": '"n0-identity"'},
+    )
+    assert stale.status_code == 200
+
+def test_etag_depends_on_encoding(client, create_news):
+    create_news()
+    br = client.get("/api/news", headers={"Accept-Encoding": "br"}).headers["etag"]
+    identity = client.get("/api/news", headers={"Accept-Encoding": "identity"}).headers["etag"]
+    assert br != identity
+    assert client.get("/api/news", headers={"Accept-Encoding": "br", "If-None-Match": identity}).status_code == 200
+
+def test_write_purges_nginx_cache(create_news, monkeypatch, tmp_path):
+    cached = tmp_path / "a" / "bc" / "0123456789abcdef"
+    cached.parent.mkdir(parents=True)
+    cached.write_bytes(b"resposta antiga")
+    monkeypatch.setattr(http_cache, "NGINX_CACHE_DIR", str(tmp_path))
+
+    create_news(title="Limpa o cache")
+    # The purge runs on the app's job queue, right after the response
+    for _ in range(100):
+        if not cached.exists():
+            break
+        time.sleep(0.01)
+    assert not cached.exists()
+    assert cached.parent.is_dir()
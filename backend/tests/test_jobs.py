@@ -0,0 +1,82 @@
+import asyncio
+
+from app.jobs import JobQueue
+
+def test_burst_is_coalesced():
+    async def scenario():
+        queue = JobQueue(concurrency=2)
+        queue.start()
+        runs = []
+
+        async def job():
+            runs.append(1)
+
+        for _ in range(10):
+            queue.submit("publish", job)
+        await queue.stop()
+        return runs, queue.coalesced
+
+    runs, coalesced = asyncio.run(scenario())
+    assert runs == [1]
+    assert coalesced == 9
+
+def test_same_key_never_runs_concurrently():
+    async def scenario():
+        queue = JobQueue(concurrency=4)
+        queue.start()
+        running, overlaps, runs = [0], [0], []
+
+        async def job():
+            running[0] += 1
+            overlaps[0] = max(overlaps[0], running[0])
+            await asyncio.sleep(0.01)
+            runs.append(1)
+            running[0] -= 1
+
+        queue.submit("publish", job)
+        await asyncio.sleep(0.001)
+        # Submitted while the first run is in progress: runs again afterwards
+        queue.submit("publish", job)
+        queue.submit("publish", job)
+        await queue.stop()
+        return overlaps[0], len(runs)
+
+    assert asyncio.run(scenario()) == (1, 2)
+
+def test_failures_are_retried():
+    async def scenario():
+        queue = JobQueue(max_attempts=3, retry_base=0.001)
+        queue.start()
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RuntimeError("falha temporária")
+
+        async def broken():
+            raise RuntimeError("falha permanente")
+
+        queue.submit("flaky", flaky)
+        queue.submit("broken", broken)
+        await queue.stop()
+        return len(attempts), queue.failed
+
+    assert asyncio.run(scenario()) == (3, 1)
+
+def test_stop_drains_queue():
+    async def scenario():
+        queue = JobQueue(concurrency=1)
+        queue.start()
+        done = []
+
+        async def job(name):
+            await asyncio.sleep(0.001)
+            done.append(name)
+
+        for name in ("a", "b", "c"):
+            queue.submit(name, lambda name=name: job(name))
+        await queue.stop(timeout=5)
+        return done, queue.pending
+
+    assert asyncio.run(scenario()) == (["a", "b", "c"], 0)
@@ -0,0 +1,45 @@
+"""
+Upload de imagens das notícias e geração das variantes
+"""
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+
+from app.media import MEDIA_DIR
+
+def _png(width, height):
+    buffer = BytesIO()
+    Image.new("RGBA", (width, height), (200, 30, 30, 128)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+def test_upload_creates_content_addressed_variants(admin, create_news):
+    news = create_news(title="Com imagem")
+    image = _png(800, 400)
+
+    response = admin.post(f"/api/news/{news['id']}/media", params={"alt": "Turma"}, content=image)
+    assert response.status_code == 200, response.text
+    media = response.json()["media"]
+    assert len(media) == 1 and media[0]["alt"] == "Turma"
+
+    variants = media[0]["variants"]
+    # 320 and 640 wide, plus the original 800 instead of upscaling to 1280
+    assert sorted({(v["width"], v["height"]) for v in variants}) == [(320, 160), (640, 320), (800, 400)]
+    assert {v["format"] for v in variants} == {"webp", "jpeg"}
+    for variant in variants:
+        name = Path(variant["url"]).name
+        assert (MEDIA_DIR / name[:2] / name).is_file()
+        assert admin.get(variant["url"]).status_code == 200
+
+    # Public reads carry the variants; the same file again is not duplicated
+    assert admin.get(f"/api/news/{news['id']}").json()["media"] == media
+    again = admin.post(f"/api/news/{news['id']}/media", content=image)
+    assert again.json()["media"] == media
+
+def test_upload_rejects_invalid_files(admin, create_news):
+    news = create_news()
+    response = admin.post(f"/api/news/{news['id']}/media", content=b"isto nao e uma imagem")
+    assert response.status_code == 400
+    assert admin.post(f"/api/news/{news['id']}/media", content=b"").status_code == 400
+    assert admin.post("/api/news/999999/media", content=_png(10, 10)).status_code == 404
+    assert not any((MEDIA_DIR / ".uploads").iterdir())
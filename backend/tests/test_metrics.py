@@ -0,0 +1,59 @@
+"""
+Métricas no formato do Prometheus (GET /api/metrics)
+"""
+import re
+
+from app import metrics
+
+SAMPLE = re.compile(r'^([a-z_]+)(\{.*\})? (\S+)$')
+
+def _samples(client):
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    samples, types = {}, {}
+    for line in response.text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, metric_type = line.split(" ")
+            types[name] = metric_type
+        elif line and not line.startswith("#"):
+            match = SAMPLE.match(line)
+            assert match, line
+            samples[match.group(1) + (match.group(2) or "")] = float(match.group(3))
+    return samples, types
+
+def test_requests_are_labelled_by_route_template(client, create_news):
+    created = create_news()
+    client.get(f"/api/news/{created['id']}")
+    client.get("/nao-existe")
+
+    samples, types = _samples(client)
+    assert types["semear_http_request_duration_seconds"] == "histogram"
+    assert types["semear_http_responses_total"] == "counter"
+    assert samples['semear_http_responses_total{method="GET",route="/api/news/{news_id}",status="200"}'] >= 1
+    assert samples['semear_http_responses_total{method="GET",route="unmatched",status="404"}'] >= 1
+    assert not any(f"/api/news/{created['id']}" in name for name in samples)
+
+def test_database_statements_are_counted_per_request(client, create_news):
+    create_news()
+    client.get("/api/news/search", params={"q": "teste"})
+
+    samples, _ = _samples(client)
+    labels = 'method="GET",route="/api/news/search"'
+    assert samples[f"semear_http_request_db_statements_count{{{labels}}}"] >= 1
+    assert samples[f"semear_http_request_db_statements_sum{{{labels}}}"] >= 1
+    assert samples["semear_db_statements_total"] > 0
+
+def test_job_totals_are_counters(client):
+    samples, types = _samples(client)
+    assert types["semear_jobs_pending"] == "gauge"
+    for name in ("semear_jobs_coalesced_total", "semear_jobs_failed_total"):
+        assert types[name] == "counter"
+        assert name in samples
+
+def test_metrics_token(client, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "segredo")
+    anonymous = type(client)(client.app)
+    assert anonymous.get("/api/metrics").status_code == 401
+    assert anonymous.get("/api/metrics", headers={"Authorization": "Bearer outro"}).status_code == 401
+    assert anonymous.get("/api/metrics", headers={"Authorization": "Bearer segredo"}).status_code == 200
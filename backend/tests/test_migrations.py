@@ -0,0 +1,42 @@
+"""
+Migrações versionadas e conferência do esquema na inicialização
+"""
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.migrations import LATEST_VERSION, SchemaOutdatedError, check_schema, migrate
+
+def _run(coroutine_function, path):
+    async def run():
+        bind = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        try:
+            return await coroutine_function(bind)
+        finally:
+            await bind.dispose()
+    return asyncio.run(run())
+
+def test_check_schema_rejects_database_without_migrations(tmp_path):
+    with pytest.raises(SchemaOutdatedError):
+        _run(check_schema, tmp_path / "vazio.db")
+
+def test_migrate_upgrades_database_created_before_migrations(tmp_path):
+    path = tmp_path / "antigo.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE news (id INTEGER PRIMARY KEY, title VARCHAR(255) NOT NULL, "
+            "excerpt TEXT NOT NULL, content TEXT NOT NULL, date DATE NOT NULL)"
+        )
+        conn.execute("INSERT INTO news VALUES (1, 'Antiga', 'Resumo', 'Conteúdo', '2020-01-01')")
+
+    assert _run(migrate, path) == (0, LATEST_VERSION)
+    assert _run(migrate, path) == (LATEST_VERSION, LATEST_VERSION)
+    assert _run(check_schema, path) == LATEST_VERSION
+
+    with sqlite3.connect(path) as conn:
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "ix_news_date_id" in indexes
+        # Rows that predate the FTS table are indexed by the migration
+        assert conn.execute("SELECT rowid FROM news_fts WHERE news_fts MATCH 'antiga'").fetchall() == [(1,)]
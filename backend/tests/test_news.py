@@ -0,0 +1,93 @@
+"""
+Comportamento dos endpoints de notícias
+"""
+from datetime import date, timedelta
+import json
+
+def _all_ids(client):
+    response = client.get("/api/news", params={"limit": 1000, "fields": "title"})
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()]
+
+def test_cursor_paging_walks_the_full_list_once(client, create_news):
+    for day in range(1, 6):
+        create_news(title=f"Paginação {day}", date=f"2023-03-{day:02d}")
+    create_news(title="Paginação mesmo dia", date="2023-03-03")
+
+    seen = []
+    params = {"limit": 2, "fields": "title"}
+    while True:
+        response = client.get("/api/news", params=params)
+        assert response.status_code == 200
+        seen += [item["id"] for item in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 2, "fields": "title", "cursor": cursor}
+
+    assert seen == _all_ids(client)
+    assert len(seen) == len(set(seen))
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/api/news", params={"cursor": "não-é-um-cursor"})
+    assert response.status_code == 400
+
+def test_writes_invalidate_cached_reads(admin, create_news):
+    news = create_news(title="Antes")
+    assert admin.get(f"/api/news/{news['id']}").json()["title"] == "Antes"
+    assert any(item["title"] == "Antes" for item in admin.get("/api/news", params={"limit": 1000}).json())
+
+    response = admin.put(f"/api/news/{news['id']}", json={"title": "Depois"})
+    assert response.status_code == 200
+    assert admin.get(f"/api/news/{news['id']}").json()["title"] == "Depois"
+    titles = [item["title"] for item in admin.get("/api/news", params={"limit": 1000}).json()]
+    assert "Depois" in titles and "Antes" not in titles
+
+    assert admin.delete(f"/api/news/{news['id']}").status_code == 204
+    assert admin.get(f"/api/news/{news['id']}").status_code == 404
+    assert news["id"] not in _all_ids(admin)
+
+def test_field_projection(client, create_news):
+    create_news()
+
+    summary = client.get("/api/news", params={"view": "summary"}).json()
+    assert summary and all(set(item) == {"id", "title", "excerpt", "date", "media"} for item in summary)
+
+    titles = client.get("/api/news", params={"fields": "title"}).json()
+    assert titles and all(set(item) == {"id", "title"} for item in titles)
+
+    assert client.get("/api/news", params={"fields": "title,senha"}).status_code == 400
+
+def test_search_ranks_title_matches_first(client, create_news):
+    in_content = create_news(title="Outra notícia", content="Fala sobre xilogravura no fim")
+    in_title = create_news(title="Oficina de xilogravura", content="Sem o termo")
+
+    results = client.get("/api/news/search", params={"q": "xilogravura"}).json()
+    assert [item["id"] for item in results] == [in_title["id"], in_content["id"]]
+
+def test_import_reports_invalid_lines(admin):
+    future = (date.today() + timedelta(days=30)).isoformat()
+    valid = {"title": "Importada", "excerpt": "Resumo", "content": "Conteúdo", "date": "2022-05-05"}
+    body = "\n".join([
+        json.dumps(valid),
+        "{não é json",
+        json.dumps({**valid, "date": future}),
+        "",
+        json.dumps({"title": "Sem os outros campos"}),
+    ])
+
+    response = admin.post("/api/news/import", content=body.encode())
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 1
+    assert result["failed"] == 3
+    assert [error["line"] for error in result["errors"]] == [2, 3, 5]
+    assert "futuro" in result["errors"][1]["error"]
+    assert any(item["title"] == "Importada" for item in admin.get("/api/news", params={"limit": 1000}).json())
+
+def test_writes_require_authentication(client):
+    anonymous = type(client)(client.app)
+    response = anonymous.post("/api/news", json={
+        "title": "x", "excerpt": "x", "content": "x", "date": "2024-01-01",
+    })
+    assert response.status_code == 401
@@ -0,0 +1,47 @@
+import pytest
+
+from app import profiling
+
+@pytest.fixture
+def profiling_on(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiling, "PROFILING_DIR", tmp_path)
+    return tmp_path
+
+def test_disabled_by_default(admin, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_DIR", tmp_path)
+    response = admin.get("/api/news", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+def test_admin_header_profiles_request(admin, profiling_on):
+    response = admin.get("/api/news", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    name = response.headers["x-profile-id"]
+
+    listed = admin.get("/api/profiles").json()
+    assert [profile["name"] for profile in listed] == [name]
+
+    download = admin.get(f"/api/profiles/{name}")
+    assert download.status_code == 200
+    for line in download.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
+
+def test_header_requires_admin(client, profiling_on):
+    anonymous = type(client)(client.app)
+    response = anonymous.get("/api/news", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert anonymous.get("/api/profiles").status_code == 401
+
+def test_sampling_and_ring_buffer(client, admin, profiling_on, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(profiling, "PROFILING_MAX_FILES", 2)
+    anonymous = type(client)(client.app)
+    names = [anonymous.get("/api/health").headers["x-profile-id"] for _ in range(3)]
+
+    assert sorted(path.name for path in profiling_on.iterdir()) == sorted(names[1:])
+    assert admin.get(f"/api/profiles/{names[0]}").status_code == 404
+    assert admin.get("/api/profiles/..%2Fsecret.collapsed").status_code == 404
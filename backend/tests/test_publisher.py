@@ -0,0 +1,81 @@
+"""
+Publicação das notícias em arquivos estáticos (app/publisher.py)
+"""
+import asyncio
+import fcntl
+import json
+import os
+import time
+
+from app import publisher
+
+def _wait_for(condition):
+    # Publishing runs on the app's job queue, right after the response
+    for _ in range(200):
+        if condition():
+            return
+        time.sleep(0.01)
+    assert condition()
+
+def test_writes_are_published_as_static_files(admin, create_news, tmp_path, monkeypatch):
+    monkeypatch.setattr(publisher, "STATIC_NEWS_DIR", str(tmp_path))
+    root = tmp_path / "news"
+    created = create_news(title="Publicada", date="1999-07-10")
+    item = root / f"{created['id']}.json"
+    july = root / "month" / "1999-07.json"
+    _wait_for(item.exists)
+
+    assert json.loads(item.read_bytes()) == admin.get(f"/api/news/{created['id']}").json()
+    assert [news["id"] for news in json.loads(july.read_bytes())] == [created["id"]]
+    index = root / "index.json"
+    listing = admin.get("/api/news")
+    # The index only exists while the whole list fits in one page
+    assert index.exists() == ("x-next-cursor" not in listing.headers)
+    if index.exists():
+        assert json.loads(index.read_bytes()) == listing.json()
+
+    # Moving the item to another month refreshes both month files
+    admin.put(f"/api/news/{created['id']}", json={"date": "1999-08-01"})
+    august = root / "month" / "1999-08.json"
+    _wait_for(lambda: not july.exists() and august.exists())
+    assert json.loads(item.read_bytes())["date"] == "1999-08-01"
+
+    admin.delete(f"/api/news/{created['id']}")
+    _wait_for(lambda: not item.exists() and not august.exists())
+
+def test_rebuild_prunes_files_of_removed_news(admin, create_news, tmp_path, monkeypatch):
+    monkeypatch.setattr(publisher, "STATIC_NEWS_DIR", str(tmp_path))
+    root = tmp_path / "news"
+    (root / "month").mkdir(parents=True)
+    (root / "987654.json").write_bytes(b"{}")
+    (root / "month" / "1900-01.json").write_bytes(b"[]")
+    created = create_news(date="1999-09-09")
+    _wait_for((root / f"{created['id']}.json").exists)
+
+    # On the app's event loop, which owns the database connections
+    total = admin.portal.call(publisher.rebuild_all)
+    assert total == len(list(root.glob("*.json"))) - (root / "index.json").exists()
+    assert not (root / "987654.json").exists()
+    assert not (root / "month" / "1900-01.json").exists()
+    assert (root / "month" / "1999-09.json").exists()
+
+def test_publishing_waits_for_other_workers(tmp_path):
+    root = tmp_path / "news"
+    # Another worker holds the lock file through its own descriptor
+    fd = os.open(tmp_path / publisher.LOCK_FILE, os.O_CREAT | os.O_RDWR)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    entered = []
+
+    async def publish():
+        async with publisher._publishing(root):
+            entered.append(True)
+
+    async def scenario():
+        task = asyncio.create_task(publish())
+        await asyncio.sleep(0.2)
+        assert not entered
+        os.close(fd)
+        await asyncio.wait_for(task, 2)
+        assert entered
+
+    asyncio.run(scenario())
@@ -0,0 +1,72 @@
+"""
+Endereço do cliente atrás de proxies confiáveis e rate limit compartilhado
+entre workers (SQLiteStorage)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from ipaddress import ip_network
+
+import pytest
+from starlette.requests import Request
+
+from app import limiter as limiter_module
+from app.limiter import get_client_ip
+from app.ratelimit_storage import SQLiteStorage
+
+@pytest.fixture
+def trusted_proxies(monkeypatch):
+    monkeypatch.setattr(limiter_module, "TRUSTED_PROXIES", [ip_network("10.0.0.0/8")])
+    limiter_module._is_trusted_proxy.cache_clear()
+    yield
+    limiter_module._is_trusted_proxy.cache_clear()
+
+def _request(peer, **headers):
+    return Request({
+        "type": "http",
+        "client": (peer, 50000),
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+def test_headers_from_untrusted_peers_are_ignored(trusted_proxies):
+    request = _request("203.0.113.9", x_forwarded_for="198.51.100.1", x_real_ip="198.51.100.2")
+    assert get_client_ip(request) == "203.0.113.9"
+
+def test_rightmost_untrusted_hop_is_the_client(trusted_proxies):
+    # The client forged the first hop; 198.51.100.7 is what our proxy saw
+    request = _request("10.0.0.2", x_forwarded_for="1.2.3.4, 198.51.100.7, 10.0.0.5")
+    assert get_client_ip(request) == "198.51.100.7"
+
+def test_only_trusted_hops_fall_back_to_the_first(trusted_proxies):
+    request = _request("10.0.0.2", x_forwarded_for="10.0.0.8, 10.0.0.5")
+    assert get_client_ip(request) == "10.0.0.8"
+
+def test_real_ip_and_peer_from_trusted_proxy(trusted_proxies):
+    assert get_client_ip(_request("10.0.0.2", x_real_ip=" 198.51.100.3 ")) == "198.51.100.3"
+    assert get_client_ip(_request("10.0.0.2")) == "10.0.0.2"
+
+def test_no_trusted_proxies_by_default(monkeypatch):
+    monkeypatch.setattr(limiter_module, "TRUSTED_PROXIES", [])
+    limiter_module._is_trusted_proxy.cache_clear()
+    assert get_client_ip(_request("10.0.0.2", x_forwarded_for="198.51.100.7")) == "10.0.0.2"
+
+def test_limit_is_shared_between_storage_instances(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'ratelimit.db'}"
+    first, second = SQLiteStorage(uri), SQLiteStorage(uri)
+
+    assert first.acquire_sliding_window_entry("client", 3, 3600)
+    assert second.acquire_sliding_window_entry("client", 3, 3600)
+    assert first.acquire_sliding_window_entry("client", 3, 3600)
+    assert not second.acquire_sliding_window_entry("client", 3, 3600)
+    assert not first.acquire_sliding_window_entry("client", 3, 3600)
+    # Other keys have their own window
+    assert second.acquire_sliding_window_entry("other", 3, 3600)
+    assert second.get_sliding_window("client", 3600)[2] == 3
+
+def test_concurrent_acquires_never_exceed_the_limit(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'ratelimit.db'}"
+    storages = [SQLiteStorage(uri), SQLiteStorage(uri)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(
+            lambda i: storages[i % 2].acquire_sliding_window_entry("burst", 20, 3600), range(60)
+        ))
+    assert results.count(True) == 20
@@ -0,0 +1,82 @@
+"""
+Leituras públicas na réplica (DATABASE_READ_URL), com leitura das próprias
+escritas e volta ao banco principal quando a réplica falha
+"""
+from pathlib import Path
+import math
+import sqlite3
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app import database
+from app.cache import news_cache
+
+def _use_replica(monkeypatch, url):
+    # NullPool: no connections are left behind for this test's event loop
+    replica = create_async_engine(url, poolclass=NullPool)
+    monkeypatch.setattr(database, "read_engine", replica)
+    monkeypatch.setattr(database, "ReadSessionLocal", async_sessionmaker(
+        replica, sync_session_class=database.ReplicaSession, expire_on_commit=False
+    ))
+    monkeypatch.setattr(database, "_replica_down_until", -math.inf)
+
+@pytest.fixture
+def stale_replica(client, tmp_path, monkeypatch):
+    """A second database holding a copy of the primary taken now"""
+    primary = database.engine.url.database
+    replica = tmp_path / "replica.db"
+    with sqlite3.connect(primary) as source, sqlite3.connect(replica) as target:
+        source.backup(target)
+    _use_replica(monkeypatch, f"sqlite+aiosqlite:///{replica}")
+
+def test_public_reads_use_the_replica(admin, create_news, stale_replica, monkeypatch):
+    created = create_news(title="Só no banco principal")
+    anonymous = type(admin)(admin.app)
+
+    # Right after a write this worker still reads from the primary...
+    assert anonymous.get(f"/api/news/{created['id']}").status_code == 200
+    # ...then reads go to the replica, which doesn't have the new row yet
+    monkeypatch.setattr(database, "_last_write", -math.inf)
+    news_cache.clear()
+    assert anonymous.get(f"/api/news/{created['id']}").status_code == 404
+
+def test_writer_keeps_reading_from_the_primary(admin, create_news, stale_replica, monkeypatch):
+    response = admin.post("/api/news", json={
+        "title": "Escrita do admin", "excerpt": "x", "content": "x", "date": "2024-01-01",
+    })
+    assert response.status_code == 201
+    assert database.PRIMARY_READS_COOKIE in response.cookies
+    monkeypatch.setattr(database, "_last_write", -math.inf)
+
+    news_id = response.json()["id"]
+    assert admin.get(f"/api/news/{news_id}").status_code == 200
+    admin.cookies.delete(database.PRIMARY_READS_COOKIE)
+    news_cache.clear()
+    assert admin.get(f"/api/news/{news_id}").status_code == 404
+
+def test_unreachable_replica_falls_back_to_the_primary(admin, create_news, tmp_path, monkeypatch):
+    created = create_news()
+    _use_replica(monkeypatch, f"sqlite+aiosqlite:///{tmp_path / 'sem-diretorio' / 'replica.db'}")
+    monkeypatch.setattr(database, "_last_write", -math.inf)
+
+    assert admin.get(f"/api/news/{created['id']}").status_code == 200
+    assert database._replica_down_until > 0
+
+def test_cache_hits_do_not_connect_to_the_replica(admin, create_news, tmp_path, monkeypatch):
+    created = create_news()
+    # Filled from the primary right after the write
+    assert admin.get(f"/api/news/{created['id']}").status_code == 200
+    _use_replica(monkeypatch, f"sqlite+aiosqlite:///{tmp_path / 'sem-diretorio' / 'replica.db'}")
+    monkeypatch.setattr(database, "_last_write", -math.inf)
+
+    assert admin.get(f"/api/news/{created['id']}").status_code == 200
+    assert database._replica_down_until == -math.inf
+
+def test_statement_writes_also_keep_the_writer_on_the_primary(admin, stale_replica):
+    # The import inserts with insert() statements, without a session flush
+    line = b'{"title": "Importada", "excerpt": "x", "content": "x", "date": "2024-01-01"}\n'
+    response = admin.post("/api/news/import", content=line)
+    assert response.status_code == 200
+    assert database.PRIMARY_READS_COOKIE in response.cookies
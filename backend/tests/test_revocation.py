@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import DATABASE_URL, RevokedToken, to_async_url
+from app.revocation import RevocationSet
+from tests.conftest import ADMIN_CREDENTIALS
+
+def _login(client):
+    session = type(client)(client.app)
+    response = session.post("/api/auth/login", json=ADMIN_CREDENTIALS)
+    assert response.status_code == 200
+    return session, response.cookies["access_token"]
+
+def test_logout_revokes_token(client):
+    session, token = _login(client)
+    bearer = {"Authorization": f"Bearer {token}"}
+    assert session.get("/api/auth/me", headers=bearer).status_code == 200
+
+    assert session.post("/api/auth/logout").status_code == 200
+    # A copy of the token no longer works, even before it expires
+    assert session.get("/api/auth/me", headers=bearer).status_code == 401
+    assert session.post("/api/auth/logout", headers=bearer).status_code == 200
+
+def test_other_sessions_stay_valid(client):
+    session, _ = _login(client)
+    other, _ = _login(client)
+    session.post("/api/auth/logout")
+    assert other.get("/api/auth/me").status_code == 200
+
+async def _with_session(work):
+    bind = create_async_engine(to_async_url(DATABASE_URL))
+    try:
+        async with async_sessionmaker(bind, expire_on_commit=False)() as db:
+            return await work(db)
+    finally:
+        await bind.dispose()
+
+def test_refresh_is_incremental_and_prune_drops_expired(client):
+    now = int(time.time())
+
+    async def scenario(db):
+        # Another worker's view: starts from what is already in the table
+        revocations = RevocationSet()
+        await revocations.refresh(db)
+        start_id = revocations.last_id
+        await db.execute(insert(RevokedToken), [
+            {"jti": "outro-worker", "expires_at": now + 3600},
+            {"jti": "expirado", "expires_at": now - 1},
+        ])
+        await db.commit()
+
+        await revocations.refresh(db)
+        loaded = (revocations.is_revoked("outro-worker"), revocations.is_revoked("expirado"))
+        assert revocations.last_id == start_id + 2
+
+        revocations.revoked["expirado"] = now - 1
+        await revocations.prune(db)
+        remaining = set(await db.scalars(select(RevokedToken.jti)))
+        return loaded, revocations.is_revoked("expirado"), remaining
+
+    loaded, expired_in_memory, remaining = asyncio.run(_with_session(scenario))
+    assert loaded == (True, False)
+    assert not expired_in_memory
+    assert "outro-worker" in remaining and "expirado" not in remaining
@@ -0,0 +1,57 @@
+"""
+Endpoint de primeira carga do site (GET /api/site)
+"""
+import sqlite3
+import time
+
+from app import database
+from app.changes import broadcaster
+
+def test_site_snapshot_has_contact_metadata_and_news_summaries(client, create_news):
+    created = create_news(title="Na página inicial", date="2024-06-01")
+
+    response = client.get("/api/site")
+    assert response.status_code == 200
+    site = response.json()
+    assert site["site"]["name"]
+    assert site["contact"] == {"email": "projetosemearlages@gmail.com", "phone": "(49) 99138-1480"}
+    assert created["id"] in [item["id"] for item in site["news"]]
+    # Summaries only; the full content comes from GET /api/news/{id}
+    assert all(set(item) == {"id", "title", "excerpt", "date", "media"} for item in site["news"])
+    summary_ids = [item["id"] for item in client.get("/api/news", params={"view": "summary"}).json()]
+    assert [item["id"] for item in site["news"]] == summary_ids
+
+def test_site_snapshot_is_rebuilt_after_news_and_contact_writes(admin, create_news):
+    before = admin.get("/api/site").json()
+
+    created = create_news(title="Depois do snapshot")
+    assert created["id"] in [item["id"] for item in admin.get("/api/site").json()["news"]]
+
+    contact = {"email": "contato@projetosemear.org.br", "phone": " (49) 3222-0000 "}
+    response = admin.put("/api/site/contact", json=contact)
+    assert response.status_code == 200
+    assert response.json() == {"email": "contato@projetosemear.org.br", "phone": "(49) 3222-0000"}
+    assert admin.get("/api/site").json()["contact"] == response.json()
+
+    admin.put("/api/site/contact", json=before["contact"])
+
+def test_site_snapshot_sees_other_workers_contact_writes(client):
+    original = client.get("/api/site").json()["contact"]
+
+    # Another worker's update only shows up in the database
+    with sqlite3.connect(database.engine.url.database) as conn:
+        conn.execute("UPDATE contacts SET phone = '(49) 3000-0000', version = version + 1")
+    version = broadcaster.contact_version
+    for _ in range(60):
+        if broadcaster.contact_version > version:
+            break
+        time.sleep(0.1)
+    assert client.get("/api/site").json()["contact"]["phone"] == "(49) 3000-0000"
+
+    client.put("/api/site/contact", json=original)
+
+def test_contact_update_requires_authentication(client):
+    anonymous = type(client)(client.app)
+    response = anonymous.put("/api/site/contact", json={"email": "x@example.com", "phone": "1"})
+    assert response.status_code == 401
+    assert client.put("/api/site/contact", json={"email": "inválido", "phone": "1"}).status_code == 422
@@ -139,7 +139,7 @@ export function AdminDashboard({ onBack, onLogout }: AdminDashboardProps) {
     setNewsForm({
       title: item.title,
       excerpt: item.excerpt,
-      content: item.content,
+      content: item.content ?? '',
       date: localDate,
     });
   };
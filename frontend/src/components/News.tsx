@@ -4,6 +4,7 @@ import { Button } from './ui/button';
 import { Calendar } from 'lucide-react';
 import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle } from './ui/dialog';
 import { useData } from '../contexts/DataContext';
+import type { NewsMedia } from '../services/api';
 
 // Helper function to parse date string as local date (not UTC)
 const parseLocalDate = (dateString: string): string => {
@@ -12,6 +13,33 @@ const parseLocalDate = (dateString: string): string => {
   return date.toLocaleDateString('pt-BR');
 };
 
+// Responsive image: WebP when the browser supports it, JPEG otherwise
+function NewsImage({ media }: { media: NewsMedia }) {
+  const srcSet = (format: string) =>
+    media.variants
+      .filter((variant) => variant.format === format)
+      .map((variant) => `${variant.url} ${variant.width}w`)
+      .join(', ');
+  const fallback = media.variants.find((variant) => variant.format === 'jpeg');
+  const sizes = '(min-width: 768px) 33vw, 100vw';
+
+  return (
+    <picture>
+      <source type="image/webp" srcSet={srcSet('webp')} sizes={sizes} />
+      <img
+        src={fallback?.url}
+        srcSet={srcSet('jpeg')}
+        sizes={sizes}
+        width={fallback?.width}
+        height={fallback?.height}
+        alt={media.alt}
+        loading="lazy"
+        className="w-full h-48 object-cover"
+      />
+    </picture>
+  );
+}
+
 interface NewsProps {
   onViewAll: () => void;
 }
@@ -20,13 +48,24 @@ export interface NewsItem {
   id: string;
   title: string;
   excerpt: string;
-  content: string;
+  content?: string;
   date: string;
+  media?: NewsMedia[];
 }
 
 export function News({ onViewAll }: NewsProps) {
-  const { news } = useData();
+  const { news, loadNewsItem } = useData();
   const [selectedNews, setSelectedNews] = useState<NewsItem | null>(null);
+
+  // The list only has summaries; fetch the full content when a news item is opened
+  const openNews = (item: NewsItem) => {
+    setSelectedNews(item);
+    if (item.content === undefined) {
+      loadNewsItem(item.id)
+        .then((fullItem) => setSelectedNews((current) => (current?.id === fullItem.id ? fullItem : current)))
+        .catch((error) => console.error('Error loading news item:', error));
+    }
+  };
   
   // Show only the first 3 news items
   const newsItems = news.slice(0, 3);
@@ -46,8 +85,9 @@ export function News({ onViewAll }: NewsProps) {
             <Card 
               key={item.id} 
               className="overflow-hidden hover:shadow-lg transition-all duration-300 hover:scale-105 cursor-pointer"
-              onClick={() => setSelectedNews(item)}
+              onClick={() => openNews(item)}
             >
+              {item.media?.[0] && <NewsImage media={item.media[0]} />}
               <CardContent className="p-6">
                 <div className="flex items-center gap-2 text-sm text-gray-500 mb-2">
                   <Calendar size={16} />
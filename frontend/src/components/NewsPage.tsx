@@ -1,10 +1,12 @@
-import { useState } from 'react';
+import { useState, useEffect } from 'react';
 import { Card, CardContent } from './ui/card';
 import { Button } from './ui/button';
 import { ArrowLeft, Calendar, ArrowUpDown } from 'lucide-react';
 import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle } from './ui/dialog';
 import type { NewsItem } from './News';
 import { useData } from '../contexts/DataContext';
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from './ui/select';
+import { api } from '../services/api';
 
 // Helper function to parse date string as local date (not UTC)
 const parseLocalDate = (dateString: string): string => {
@@ -13,19 +15,77 @@ const parseLocalDate = (dateString: string): string => {
   return date.toLocaleDateString('pt-BR');
 };
 
+interface ArchiveMonth {
+  year: number;
+  month: number;
+  count: number;
+}
+
+const monthKey = ({ year, month }: ArchiveMonth) => `${year}-${String(month).padStart(2, '0')}`;
+
+const monthLabel = ({ year, month }: ArchiveMonth) =>
+  new Date(year, month - 1, 1).toLocaleDateString('pt-BR', { month: 'long', year: 'numeric' });
+
 interface NewsPageProps {
   onBack: () => void;
 }
 
 export function NewsPage({ onBack }: NewsPageProps) {
-  const { news } = useData();
+  const { news, loadNewsItem } = useData();
 
   // Sort state
   const [sortOrder, setSortOrder] = useState<'asc' | 'desc'>('desc');
   const [selectedNews, setSelectedNews] = useState<NewsItem | null>(null);
 
+  // The list only has summaries; fetch the full content when a news item is opened
+  const openNews = (item: NewsItem) => {
+    setSelectedNews(item);
+    if (item.content === undefined) {
+      loadNewsItem(item.id)
+        .then((fullItem) => setSelectedNews((current) => (current?.id === fullItem.id ? fullItem : current)))
+        .catch((error) => console.error('Error loading news item:', error));
+    }
+  };
+
+  // Browse by month: counts from the archive, news of the chosen month from the API
+  const [archive, setArchive] = useState<ArchiveMonth[]>([]);
+  const [period, setPeriod] = useState('all');
+  const [periodNews, setPeriodNews] = useState<NewsItem[] | null>(null);
+
+  useEffect(() => {
+    api
+      .getNewsArchive()
+      .then(setArchive)
+      .catch((error) => console.error('Error loading news archive:', error));
+  }, []);
+
+  const selectPeriod = async (value: string) => {
+    setPeriod(value);
+    if (value === 'all') {
+      setPeriodNews(null);
+      return;
+    }
+    const [year, month] = value.split('-').map(Number);
+    const lastDay = new Date(year, month, 0).getDate();
+    try {
+      const apiNews = await api.getNews({ from: `${value}-01`, to: `${value}-${lastDay}` });
+      setPeriodNews(
+        apiNews.map((item) => ({
+          id: item.id.toString(),
+          title: item.title,
+          excerpt: item.excerpt,
+          content: item.content,
+          date: item.date,
+          media: item.media,
+        }))
+      );
+    } catch (error) {
+      console.error('Error loading news for period:', error);
+    }
+  };
+
   // Sort news by date
-  const sortedNews = [...news].sort((a, b) => {
+  const sortedNews = [...(periodNews ?? news)].sort((a, b) => {
     const dateA = new Date(a.date).getTime();
     const dateB = new Date(b.date).getTime();
     return sortOrder === 'desc' ? dateB - dateA : dateA - dateB;
@@ -50,14 +110,29 @@ export function NewsPage({ onBack }: NewsPageProps) {
         <div className="mb-12">
           <div className="flex items-center justify-between mb-4">
             <h1>Todas as Notícias</h1>
-            <Button
-              onClick={toggleSortOrder}
-              variant="outline"
-              className="gap-2"
-            >
-              <ArrowUpDown size={16} />
-              {sortOrder === 'desc' ? 'Mais recentes' : 'Mais antigas'}
-            </Button>
+            <div className="flex items-center gap-2">
+              <Select value={period} onValueChange={selectPeriod}>
+                <SelectTrigger className="w-56">
+                  <SelectValue placeholder="Período" />
+                </SelectTrigger>
+                <SelectContent>
+                  <SelectItem value="all">Todos os períodos</SelectItem>
+                  {archive.map((entry) => (
+                    <SelectItem key={monthKey(entry)} value={monthKey(entry)}>
+                      {monthLabel(entry)} ({entry.count})
+                    </SelectItem>
+                  ))}
+                </SelectContent>
+              </Select>
+              <Button
+                onClick={toggleSortOrder}
+                variant="outline"
+                className="gap-2"
+              >
+                <ArrowUpDown size={16} />
+                {sortOrder === 'desc' ? 'Mais recentes' : 'Mais antigas'}
+              </Button>
+            </div>
           </div>
           <p className="text-xl text-gray-600">
             Fique por dentro de todas as novidades e conquistas do Projeto Semear Lages
@@ -69,7 +144,7 @@ export function NewsPage({ onBack }: NewsPageProps) {
             <Card 
               key={item.id} 
               className="overflow-hidden hover:shadow-lg transition-all duration-300 hover:scale-105 cursor-pointer"
-              onClick={() => setSelectedNews(item)}
+              onClick={() => openNews(item)}
             >
               <CardContent className="p-6">
                 <div className="flex items-center gap-2 text-sm text-gray-500 mb-2">
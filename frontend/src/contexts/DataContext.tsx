@@ -1,4 +1,4 @@
-import { createContext, useContext, useState, useEffect, ReactNode } from 'react';
+import { createContext, useContext, useState, useEffect, useRef, ReactNode } from 'react';
 import type { NewsItem } from '../components/News';
 import type { ContactInfo } from '../components/Contact';
 import { api } from '../services/api';
@@ -10,8 +10,13 @@ interface DataContextType {
   contactInfo: ContactInfo;
   setContactInfo: (info: ContactInfo) => void;
   refreshNews: () => Promise<void>;
+  loadNewsItem: (id: string) => Promise<NewsItem>;
 }
 
+// Same order as the API: newest first, then highest id
+const byDateDesc = (a: NewsItem, b: NewsItem) =>
+  b.date.localeCompare(a.date) || Number(b.id) - Number(a.id);
+
 const DataContext = createContext<DataContextType | undefined>(undefined);
 
 export function DataProvider({ children }: { children: ReactNode }) {
@@ -20,29 +25,138 @@ export function DataProvider({ children }: { children: ReactNode }) {
     email: 'projetosemearlages@gmail.com',
     phone: '(49) 99138-1480',
   });
+  // Change feed version the news list is up to date with
+  const versionRef = useRef<number | null>(null);
+  const syncingRef = useRef(false);
+  const resyncRef = useRef(false);
+  // Version of the first snapshot; the change stream starts from it
+  const [streamSince, setStreamSince] = useState<number | null>(null);
 
-  const loadNews = async () => {
+  // One request for the whole first page load: news summaries and contact info
+  const loadSite = async () => {
     try {
-      const apiNews = await api.getNews();
-      // Convert API response to NewsItem format
-      const formattedNews: NewsItem[] = apiNews.map((item) => ({
+      const site = await api.getSite();
+      // Convert API response to NewsItem format; content is loaded on demand
+      const formattedNews: NewsItem[] = site.news.map((item) => ({
         id: item.id.toString(),
         title: item.title,
         excerpt: item.excerpt,
-        content: item.content,
         date: item.date,
+        media: item.media,
       }));
       setNews(formattedNews);
+      versionRef.current = site.news_version;
+      setStreamSince((current) => current ?? site.news_version);
+      if (site.contact) {
+        setContactInfo(site.contact);
+      }
     } catch (error) {
-      console.error('Error loading news:', error);
+      console.error('Error loading site data:', error);
       // Keep empty array on error - don't show mock data
     }
   };
 
+  // Apply only the news changed since the last known version
+  const syncNews = async () => {
+    if (versionRef.current === null) {
+      return loadSite();
+    }
+    if (syncingRef.current) {
+      // Picked up by the sync in progress once it finishes
+      resyncRef.current = true;
+      return;
+    }
+    syncingRef.current = true;
+    try {
+      let hasMore = true;
+      while (hasMore) {
+        const since = versionRef.current as number;
+        const feed = await api.getNewsChanges(since);
+        if (feed.version < since) {
+          // The server's feed was reset; start over
+          versionRef.current = null;
+          await loadSite();
+          return;
+        }
+        const changed = new Map(
+          feed.changes.map((item) => [
+            item.id.toString(),
+            {
+              id: item.id.toString(),
+              title: item.title,
+              excerpt: item.excerpt,
+              content: item.content,
+              date: item.date,
+              media: item.media,
+            } as NewsItem,
+          ])
+        );
+        const deleted = new Set(feed.deleted.map((id) => id.toString()));
+        setNews((current) =>
+          [
+            ...current.filter((item) => !changed.has(item.id) && !deleted.has(item.id)),
+            ...changed.values(),
+          ].sort(byDateDesc)
+        );
+        versionRef.current = feed.version;
+        hasMore = feed.has_more;
+      }
+    } catch (error) {
+      console.error('Error syncing news:', error);
+    } finally {
+      syncingRef.current = false;
+    }
+    if (resyncRef.current) {
+      resyncRef.current = false;
+      await syncNews();
+    }
+  };
+
+  // Full news item, including content; replaces the summary in the list
+  const loadNewsItem = async (id: string) => {
+    const item = await api.getNewsItem(Number(id));
+    const fullItem: NewsItem = {
+      id: item.id.toString(),
+      title: item.title,
+      excerpt: item.excerpt,
+      content: item.content,
+      date: item.date,
+      media: item.media,
+    };
+    setNews((current) => current.map((existing) => (existing.id === id ? fullItem : existing)));
+    return fullItem;
+  };
+
   useEffect(() => {
-    loadNews();
+    loadSite();
   }, []);
 
+  // Server push: each new version triggers a delta sync. Opened only after
+  // the snapshot, from its version, so no write in between goes unannounced
+  useEffect(() => {
+    if (streamSince === null || typeof EventSource === 'undefined') {
+      return;
+    }
+    const stream = api.newsChangesStream(streamSince);
+    // Also on reconnects: catches anything written while disconnected
+    const onOpen = () => {
+      syncNews();
+    };
+    const onVersion = (event: MessageEvent) => {
+      const { version } = JSON.parse(event.data);
+      if (versionRef.current !== null && version > versionRef.current) {
+        syncNews();
+      }
+    };
+    stream.addEventListener('open', onOpen);
+    stream.addEventListener('version', onVersion);
+    return () => {
+      stream.removeEventListener('open', onOpen);
+      stream.removeEventListener('version', onVersion);
+      stream.close();
+    };
+  }, [streamSince]);
+
   return (
     <DataContext.Provider 
       value={{ 
@@ -50,7 +164,8 @@ export function DataProvider({ children }: { children: ReactNode }) {
         setNews, 
         contactInfo, 
         setContactInfo,
-        refreshNews: loadNews,
+        refreshNews: syncNews,
+        loadNewsItem,
       }}
     >
       {children}
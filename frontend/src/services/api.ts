@@ -17,6 +17,17 @@ class ApiError extends Error {
   }
 }
 
+export interface NewsMedia {
+  id: string;
+  alt: string;
+  variants: Array<{
+    url: string;
+    format: 'webp' | 'jpeg';
+    width: number;
+    height: number;
+  }>;
+}
+
 async function apiRequest<T>(
   endpoint: string,
   options: RequestOptions = {}
@@ -92,7 +103,11 @@ export const api = {
   },
 
   // News endpoints
-  async getNews() {
+  // `from`/`to` (YYYY-MM-DD, inclusive) limit the list to a period
+  async getNews(period: { from?: string; to?: string } = {}) {
+    const params = new URLSearchParams(
+      Object.entries(period).filter(([, value]) => value) as [string, string][]
+    ).toString();
     return apiRequest<
       Array<{
         id: number;
@@ -100,8 +115,53 @@ export const api = {
         excerpt: string;
         content: string;
         date: string;
+        media: NewsMedia[];
       }>
-    >('/api/news');
+    >(params ? `/api/news?${params}` : '/api/news');
+  },
+
+  // Number of news items per month, newest month first
+  async getNewsArchive() {
+    return apiRequest<Array<{ year: number; month: number; count: number }>>('/api/news/archive');
+  },
+
+  // Everything the first page load needs: news summaries (no content), contact and metadata
+  async getSite() {
+    return apiRequest<{
+      site: { name: string; description: string };
+      contact: { email: string; phone: string } | null;
+      news: Array<{
+        id: number;
+        title: string;
+        excerpt: string;
+        date: string;
+        media: NewsMedia[];
+      }>;
+      news_next_cursor: string | null;
+      news_version: number;
+    }>('/api/site');
+  },
+
+  // Only what changed after `since`: current state of changed items and deleted ids
+  async getNewsChanges(since: number) {
+    return apiRequest<{
+      version: number;
+      changes: Array<{
+        id: number;
+        title: string;
+        excerpt: string;
+        content: string;
+        date: string;
+        media: NewsMedia[];
+      }>;
+      deleted: number[];
+      has_more: boolean;
+    }>(`/api/news/changes?since=${since}&limit=1000`);
+  },
+
+  // Server-sent events announcing each new change version after `since`
+  newsChangesStream(since: number) {
+    return new EventSource(`${API_BASE_URL}/api/news/changes/stream?since=${since}`);
   },
 
   async getNewsItem(id: number) {
@@ -111,6 +171,7 @@ export const api = {
       excerpt: string;
       content: string;
       date: string;
+      media: NewsMedia[];
     }>(`/api/news/${id}`);
   },
 
@@ -206,6 +267,53 @@ export const api = {
     });
   },
 
+  // Several edits/deletes in one request and one transaction
+  async batchNews(
+    operations: Array<
+      | {
+          op: 'update';
+          id: number;
+          changes: { title?: string; excerpt?: string; content?: string; date?: string };
+        }
+      | { op: 'delete'; id: number }
+    >
+  ) {
+    return apiRequest<{
+      updated: number;
+      deleted: number;
+      failed: number;
+      results: Array<{
+        index: number;
+        id: number | null;
+        op: string | null;
+        status: 'updated' | 'deleted' | 'not_found' | 'invalid';
+        error: string | null;
+      }>;
+    }>('/api/news/batch', {
+      method: 'POST',
+      body: JSON.stringify({ operations }),
+      requiresAuth: true,
+    });
+  },
+
+  async uploadNewsMedia(id: number, file: File, alt: string = '') {
+    // The image is sent as the raw request body, not as multipart form data
+    const params = new URLSearchParams({ alt: alt.trim() });
+    return apiRequest<{
+      id: number;
+      title: string;
+      excerpt: string;
+      content: string;
+      date: string;
+      media: NewsMedia[];
+    }>(`/api/news/${id}/media?${params}`, {
+      method: 'POST',
+      headers: { 'Content-Type': file.type || 'application/octet-stream' },
+      body: file,
+      requiresAuth: true,
+    });
+  },
+
   async deleteNews(id: number) {
     return apiRequest<void>(`/api/news/${id}`, {
       method: 'DELETE',